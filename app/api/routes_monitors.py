@@ -80,7 +80,7 @@ async def start_monitor(request: MonitorRequest) -> MonitorActionResponse:
 async def stop_monitor(request: MonitorRequest) -> MonitorActionResponse:
     """Stop monitoring specified symbols."""
     try:
-        result = monitor_manager.stop_monitor(
+        result = await monitor_manager.stop_monitor(
             tickers=request.tickers,
             indicator=request.indicator,
             signal_type=request.signal_type,
@@ -136,7 +136,7 @@ async def start_wave_scanner(request: WaveScanRequest, req: Request) -> MonitorA
 @router.post("/monitors/wave/stop", response_model=MonitorActionResponse)
 async def stop_wave_scanner(request: WaveScanRequest) -> MonitorActionResponse:
     """Stop a running Elliott Wave scanner."""
-    result = monitor_manager.stop_wave_scanner(
+    result = await monitor_manager.stop_wave_scanner(
         symbols=request.symbols,
         interval=request.interval,
     )
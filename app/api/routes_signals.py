@@ -13,9 +13,11 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from datetime import datetime
 from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
 
 from app.api.schemas.bars import Bar
 from app.api.schemas.signals import Signal
@@ -29,6 +31,13 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# /bars can return tens of thousands of rows (/signals, with a large `limit`,
+# thousands). Both routes build validated models themselves, so they
+# serialize them straight to JSON bytes (pydantic-core, Rust) and skip
+# FastAPI's second validation pass over `response_model`.
+_BARS_JSON = TypeAdapter(list[Bar])
+_SIGNALS_JSON = TypeAdapter(list[Signal])
+
 
 # ─────────────────────────────────────────────────────────────────────
 # Dependency providers (override in tests)
@@ -71,16 +80,24 @@ def _ts(v: Any) -> Optional[str]:
 async def list_signals(
     symbol: Optional[str] = None,
     limit: int = 50,
+    before: Optional[datetime] = Query(
+        None,
+        description=(
+            "Keyset cursor: only signals strictly older than this. Pass the "
+            "last row's `ts` to fetch the next page."
+        ),
+    ),
     reader: SignalReader = Depends(get_signal_reader),
-) -> list[Signal]:
+) -> Response:
     """
     Return recent signals (optionally filtered to `symbol`),
     newest-first. Response shape preserved verbatim for the dashboard.
+    Serialized the same way as /bars.
     """
     signals = await asyncio.to_thread(
-        reader.get_signals_by_symbol, symbol, limit
+        reader.get_signals_by_symbol, symbol, limit, before
     )
-    return [
+    out = [
         Signal(
             symbol=s.symbol,
             type=s.signal_type,
@@ -91,6 +108,7 @@ async def list_signals(
         )
         for s in signals
     ]
+    return Response(_SIGNALS_JSON.dump_json(out), media_type="application/json")
 
 
 @router.get("/bars", response_model=list[Bar])
@@ -125,7 +143,7 @@ async def list_bars(
         ),
     ),
     reader: BarReader = Depends(get_bar_reader),
-) -> list[Bar]:
+) -> Response:
     """
     Return OHLCV bars for `symbol` at `interval`, routed across the
     ClickHouse hot cache and the S3 lake by `source` (see param). The
@@ -155,7 +173,7 @@ async def list_bars(
         reader=reader,
     )
 
-    return [
+    out = [
         Bar(
             ts=_ts(b.timestamp) or "",
             open=b.open,
@@ -169,6 +187,7 @@ async def list_bars(
         )
         for b in bars
     ]
+    return Response(_BARS_JSON.dump_json(out), media_type="application/json")
 
 
 @router.get("/bars/latest")
@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 
 from pydantic import BaseModel
@@ -591,6 +592,26 @@ def get_provider(provider_name: str | None = None):
         raise ValueError(f"Unsupported provider: {provider}")
 
 
+def get_shared_provider(provider_name: str | None = None):
+    """
+    Process-wide provider instance for REST-only callers (quotes banner,
+    MCP tools) that would otherwise build a provider per request.
+
+    A fresh SchwabProvider starts without an access token, so every
+    per-request instance paid an OAuth token exchange before its first
+    call. Shared instances keep the token (they already reset it on 401)
+    and open an HTTP session per call, so sharing across requests and
+    event loops is safe. Do NOT use for streaming: monitors and the
+    stream service need their own instance (`get_provider()`).
+    """
+    return _shared_provider((provider_name or settings.data_provider).strip().lower())
+
+
+@lru_cache(maxsize=None)
+def _shared_provider(provider_name: str):
+    return get_provider(provider_name)
+
+
 def get_stream_provider():
     """Provider used for live WebSocket bars."""
     return get_provider(settings.effective_stream_provider)
@@ -609,20 +630,11 @@ def get_market_quotes_provider():
     If the primary provider has no quotes (e.g. Alpaca) but Schwab OAuth is
     configured, returns a ``SchwabProvider`` so the tape still works.
     """
-    p = get_provider()
+    p = get_shared_provider()
     if getattr(p, "get_quotes", None) is not None:
         return p
     cid = (settings.schwab_client_id or "").strip()
     csec = (settings.schwab_client_secret or "").strip()
     if cid and csec and settings.get_schwab_refresh_token():
-        from app.providers.schwab_provider import SchwabProvider
-
-        return SchwabProvider(
-            client_id=settings.schwab_client_id,
-            client_secret=settings.schwab_client_secret,
-            refresh_token=settings.get_schwab_refresh_token(),
-            callback_url=settings.schwab_callback_url or None,
-            base_url=settings.schwab_base_url,
-            refresh_token_file=settings.schwab_refresh_token_file or None,
-        )
+        return get_shared_provider("schwab")
     return p
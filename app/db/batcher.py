@@ -80,12 +80,16 @@ class AsyncBarBatcher:
             pass
 
     async def add(self, row: Dict[str, Any]) -> None:
+        # Swap the full buffer out under the lock but insert outside it (as
+        # `flush` does), so rows arriving during the round-trip queue up for
+        # the next batch instead of waiting on this one.
         async with self._lock:
             self._buf.append(row)
-            if len(self._buf) >= self._flush_size:
-                batch = self._buf
-                self._buf = []
-                await self._send_batch(batch)
+            if len(self._buf) < self._flush_size:
+                return
+            batch = self._buf
+            self._buf = []
+        await self._send_batch(batch)
 
     async def flush(self) -> None:
         async with self._lock:
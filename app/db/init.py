@@ -94,6 +94,19 @@ def init_schema() -> None:
         SETTINGS index_granularity = 8192
         """
     )
+    # Newest-first across all symbols (`list_signals` without a symbol, the
+    # `before` keyset cursor, recent_signals) can't use the
+    # (symbol, ts_signal) key; this projection keeps a ts_signal-ordered
+    # copy so those reads prune and scan in time order. Parts written
+    # before it existed pick it up as they merge (or run
+    # `ALTER TABLE signals MATERIALIZE PROJECTION by_ts_signal` once).
+    try:
+        client.command(
+            "ALTER TABLE signals ADD PROJECTION IF NOT EXISTS by_ts_signal "
+            "(SELECT * ORDER BY ts_signal)"
+        )
+    except Exception as exc:  # noqa: BLE001 — migration is best-effort
+        logger.warning("signals projection skipped: %s", exc)
 
     # Watchlists: soft-deleted via `is_active`. We never DROP rows so an LLM/agent
     # can later query "what was in this watchlist on 2026-05-01?". `kind` lets us
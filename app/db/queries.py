@@ -7,6 +7,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any, List, Optional
 
+import numpy as np
 import pandas as pd
 
 from app.db.client import get_client
@@ -29,6 +30,46 @@ _INTRADAY_COLUMNS = [
     "version",
 ]
 
+# Declared insert types (mirror app/db/init.py). Passing these to
+# `client.insert` skips the per-call `DESCRIBE TABLE` round-trip
+# clickhouse-connect otherwise makes to learn the column types.
+_INTRADAY_TYPES = [
+    "LowCardinality(String)",
+    "DateTime64(3, 'UTC')",
+    "Float64",
+    "Float64",
+    "Float64",
+    "Float64",
+    "Float64",
+    "Float64",
+    "UInt32",
+    "LowCardinality(String)",
+    "UInt64",
+]
+
+_SIGNAL_COLUMNS = [
+    "id",
+    "symbol",
+    "signal_type",
+    "indicator",
+    "ts_signal",
+    "price_at_signal",
+    "indicator_value",
+    "p1_ts",
+    "p2_ts",
+]
+_SIGNAL_TYPES = [
+    "UUID",
+    "LowCardinality(String)",
+    "LowCardinality(String)",
+    "LowCardinality(String)",
+    "DateTime64(3, 'UTC')",
+    "Float64",
+    "Float64",
+    "DateTime64(3, 'UTC')",
+    "DateTime64(3, 'UTC')",
+]
+
 
 # Intraday 1-min bar tables that share the identical column shape +
 # ReplacingMergeTree(version) engine. Equities and futures live in
@@ -92,7 +133,9 @@ def _insert_intraday(table: str, rows: List[dict]) -> None:
                 int(r.get("version") or ver),
             ]
         )
-    client.insert(table, data, column_names=_INTRADAY_COLUMNS)
+    client.insert(
+        table, data, column_names=_INTRADAY_COLUMNS, column_type_names=_INTRADAY_TYPES
+    )
 
 
 def insert_bars_batch(rows: List[dict], table: str = "ohlcv_1m") -> None:
@@ -101,6 +144,54 @@ def insert_bars_batch(rows: List[dict], table: str = "ohlcv_1m") -> None:
     _insert_intraday(table, rows)
 
 
+def insert_bars_frame(
+    symbol: str, df: pd.DataFrame, *, source: str = "", table: str = "ohlcv_1m"
+) -> int:
+    """
+    Insert a timestamp-indexed OHLCV frame for one symbol in a single
+    column-oriented insert. Returns rows written.
+
+    The bulk path for provider pulls: columns go to the driver as arrays
+    (no per-row dicts/lists) and the whole frame lands as one insert —
+    one part on the server instead of one per 1k-row batch. Optional
+    `vwap` / `trade_count` columns default to 0 like `_insert_intraday`.
+    """
+    if table not in _INTRADAY_BAR_TABLES:
+        raise ValueError(f"Unsupported table: {table!r} (allowed: {sorted(_INTRADAY_BAR_TABLES)})")
+    n = len(df)
+    if n == 0:
+        return 0
+    idx = pd.DatetimeIndex(df.index)
+    idx = idx.tz_localize("UTC") if idx.tz is None else idx.tz_convert("UTC")
+
+    def _col(name: str, dtype) -> Any:
+        if name not in df.columns:
+            return np.zeros(n, dtype=dtype)
+        return df[name].fillna(0).to_numpy(dtype=dtype)
+
+    columns = [
+        [symbol] * n,
+        list(idx.to_pydatetime()),
+        _col("open", np.float64),
+        _col("high", np.float64),
+        _col("low", np.float64),
+        _col("close", np.float64),
+        _col("volume", np.float64),
+        _col("vwap", np.float64),
+        _col("trade_count", np.uint32),
+        [source] * n,
+        np.full(n, _now_version(), dtype=np.uint64),
+    ]
+    get_client().insert(
+        table,
+        columns,
+        column_names=_INTRADAY_COLUMNS,
+        column_type_names=_INTRADAY_TYPES,
+        column_oriented=True,
+    )
+    return n
+
+
 def insert_signals_batch(rows: List[dict]) -> None:
     if not rows:
         return
@@ -126,19 +217,7 @@ def insert_signals_batch(rows: List[dict]) -> None:
             ]
         )
     client.insert(
-        "signals",
-        data,
-        column_names=[
-            "id",
-            "symbol",
-            "signal_type",
-            "indicator",
-            "ts_signal",
-            "price_at_signal",
-            "indicator_value",
-            "p1_ts",
-            "p2_ts",
-        ],
+        "signals", data, column_names=_SIGNAL_COLUMNS, column_type_names=_SIGNAL_TYPES
     )
 
 
@@ -163,29 +242,42 @@ def fetch_bars(
         LIMIT {{lim:UInt32}}
         """,
         parameters={"sym": symbol, "start": start, "end": end, "lim": limit},
+        column_oriented=True,
     )
-    if not result.result_rows:
+    # Column-oriented: each column goes straight into a float64 array
+    # instead of pandas transposing ~10k row tuples.
+    cols = result.result_columns
+    if not cols or not len(cols[0]):  # no rows: no blocks, so no columns either
         return pd.DataFrame()
-    df = pd.DataFrame(
-        result.result_rows,
-        columns=["timestamp", "open", "high", "low", "close", "volume"],
+    ts, *ohlcv = cols
+    return pd.DataFrame(
+        {
+            name: np.asarray(col, dtype=np.float64)
+            for name, col in zip(("open", "high", "low", "close", "volume"), ohlcv)
+        },
+        index=pd.DatetimeIndex(pd.to_datetime(ts, utc=True), name="timestamp"),
     )
-    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
-    df.set_index("timestamp", inplace=True)
-    return df
 
 
-def list_bars_desc(
+def list_bars_latest(
     symbol: str, limit: int, *, source_table: str = "ohlcv_1m"
 ) -> List[dict]:
+    """
+    The newest `limit` bars of `symbol`, returned oldest-first (ascending
+    `ts`) — ready to chart or feed indicators; do not reverse.
+    """
     client = get_client()
     inner = _dedup_ohlc_intraday_subquery(source_table, "symbol = {sym:String}")
+    # Newest N, handed back oldest-first by the server (no Python reverse).
     result = client.query(
         f"""
-        SELECT timestamp, open, high, low, close, volume
-        FROM ({inner}) AS deduped
-        ORDER BY timestamp DESC
-        LIMIT {{lim:UInt32}}
+        SELECT * FROM (
+            SELECT timestamp, open, high, low, close, volume
+            FROM ({inner}) AS deduped
+            ORDER BY timestamp DESC
+            LIMIT {{lim:UInt32}}
+        )
+        ORDER BY timestamp
         """,
         parameters={"sym": symbol, "lim": limit},
     )
@@ -202,7 +294,7 @@ def list_bars_desc(
                 "volume": int(v) if v is not None else 0,
             }
         )
-    return list(reversed(out))
+    return out
 
 
 # Map interval strings to ClickHouse INTERVAL expressions. We keep the storage
@@ -248,7 +340,7 @@ def list_bars_resampled(
     if interval not in SUPPORTED_INTERVALS:
         raise ValueError(f"Unsupported interval: {interval!r}")
     if interval == "1m" and start is None and end is None:
-        return list_bars_desc(symbol, limit, source_table=source_table)
+        return list_bars_latest(symbol, limit, source_table=source_table)
 
     where_parts = ["symbol = {sym:String}"]
     params: dict = {"sym": symbol.upper(), "lim": int(limit)}
@@ -270,21 +362,24 @@ def list_bars_resampled(
     else:
         bucket_expr = f"toStartOfInterval(timestamp, {interval_expr})"
 
-    # ORDER BY ts DESC + LIMIT keeps the NEWEST N rows; reverse in Python for
-    # ascending output.
+    # ORDER BY ts DESC + LIMIT keeps the NEWEST N rows; the outer ORDER BY
+    # returns them ascending so nothing is reversed in Python.
     dedup = _dedup_ohlc_intraday_subquery(source_table, where_clause)
     sql = f"""
-        SELECT
-            {bucket_expr} AS bucket_ts,
-            argMin(open, timestamp)  AS o,
-            max(high)                AS h,
-            min(low)                 AS l,
-            argMax(close, timestamp) AS c,
-            sum(volume)              AS v
-        FROM ({dedup}) AS deduped
-        GROUP BY bucket_ts
-        ORDER BY bucket_ts DESC
-        LIMIT {{lim:UInt32}}
+        SELECT * FROM (
+            SELECT
+                {bucket_expr} AS bucket_ts,
+                argMin(open, timestamp)  AS o,
+                max(high)                AS h,
+                min(low)                 AS l,
+                argMax(close, timestamp) AS c,
+                sum(volume)              AS v
+            FROM ({dedup}) AS deduped
+            GROUP BY bucket_ts
+            ORDER BY bucket_ts DESC
+            LIMIT {{lim:UInt32}}
+        )
+        ORDER BY bucket_ts
     """
     result = get_client().query(sql, parameters=params)
     out: List[dict] = []
@@ -300,38 +395,43 @@ def list_bars_resampled(
                 "volume": int(v) if v is not None else 0,
             }
         )
-    return list(reversed(out))
+    return out
+
 
+def list_signals(
+    symbol: Optional[str], limit: int, before: Optional[datetime] = None
+) -> List[dict]:
+    """
+    Newest-first signals, optionally for one `symbol`.
 
-def list_signals(symbol: Optional[str], limit: int) -> List[dict]:
+    `before` is a keyset cursor: pass the `ts` of the last row of the
+    previous page to get the next one. Unlike OFFSET, the server only
+    reads the page itself — with `symbol` set, `(symbol, ts_signal)` is
+    a prefix of the table's sort key, so ClickHouse reads in key order.
+    """
     client = get_client()
+    where = []
+    params: dict[str, Any] = {"lim": limit}
     if symbol:
-        result = client.query(
-            """
-            SELECT
-                toString(id) AS id,
-                symbol, signal_type, indicator, ts_signal,
-                price_at_signal, indicator_value
-            FROM signals
-            WHERE symbol = {sym:String}
-            ORDER BY ts_signal DESC
-            LIMIT {lim:UInt32}
-            """,
-            parameters={"sym": symbol, "lim": limit},
-        )
-    else:
-        result = client.query(
-            """
-            SELECT
-                toString(id) AS id,
-                symbol, signal_type, indicator, ts_signal,
-                price_at_signal, indicator_value
-            FROM signals
-            ORDER BY ts_signal DESC
-            LIMIT {lim:UInt32}
-            """,
-            parameters={"lim": limit},
-        )
+        where.append("symbol = {sym:String}")
+        params["sym"] = symbol
+    if before is not None:
+        where.append("ts_signal < {before:DateTime64(3, 'UTC')}")
+        params["before"] = before
+    where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+    result = client.query(
+        f"""
+        SELECT
+            toString(id) AS id,
+            symbol, signal_type, indicator, ts_signal,
+            price_at_signal, indicator_value
+        FROM signals
+        {where_sql}
+        ORDER BY ts_signal DESC
+        LIMIT {{lim:UInt32}}
+        """,
+        parameters=params,
+    )
     rows = []
     for r in result.result_rows:
         rows.append(
@@ -352,14 +452,63 @@ def recent_signals(limit: int = 5) -> List[dict]:
     return list_signals(None, limit)
 
 
+def _utc_ts(ts: Any) -> pd.Timestamp:
+    t = pd.Timestamp(ts)
+    return t.tz_localize("UTC") if t.tzinfo is None else t.tz_convert("UTC")
+
+
+def signal_key(row: dict) -> tuple:
+    """
+    Dedup key `(signal_type, indicator, p1_ts, p2_ts)` of a signal row,
+    pivot times as UTC `Timestamp`s. The client reads DateTime64 back as
+    naive UTC while rows built from a bar index are tz-aware, and the two
+    never compare equal, so both sides go through this.
+    """
+    return (row["signal_type"], row["indicator"], _utc_ts(row["p1_ts"]), _utc_ts(row["p2_ts"]))
+
+
+def signal_keys(symbol: str, start: datetime, end: datetime) -> set[tuple]:
+    """
+    `signal_key` of every stored signal for `symbol` with `ts_signal` in
+    `[start, end]`.
+
+    `signals` is a plain MergeTree (no unique key), so writers that may
+    re-emit the same divergence — backfills re-run over an overlapping
+    window — filter against this set before inserting.
+    """
+    client = get_client()
+    result = client.query(
+        """
+        SELECT DISTINCT signal_type, indicator, p1_ts, p2_ts
+        FROM signals
+        WHERE symbol = {sym:String}
+          AND ts_signal >= {start:DateTime64(3, 'UTC')}
+          AND ts_signal <= {end:DateTime64(3, 'UTC')}
+        """,
+        parameters={"sym": symbol, "start": start, "end": end},
+    )
+    cols = ("signal_type", "indicator", "p1_ts", "p2_ts")
+    return {signal_key(dict(zip(cols, r))) for r in result.result_rows}
+
+
 async def insert_bars_batch_async(rows: List[dict], table: str = "ohlcv_1m") -> None:
     await asyncio.to_thread(insert_bars_batch, rows, table)
 
 
+async def insert_bars_frame_async(
+    symbol: str, df: pd.DataFrame, *, source: str = "", table: str = "ohlcv_1m"
+) -> int:
+    return await asyncio.to_thread(insert_bars_frame, symbol, df, source=source, table=table)
+
+
 async def insert_signals_batch_async(rows: List[dict]) -> None:
     await asyncio.to_thread(insert_signals_batch, rows)
 
 
+async def signal_keys_async(symbol: str, start: datetime, end: datetime) -> set[tuple]:
+    return await asyncio.to_thread(signal_keys, symbol, start, end)
+
+
 def latest_bar_per_symbol(symbols: List[str]) -> List[dict]:
     """Return the most recent bar for each requested symbol (ClickHouse `argMax`)."""
     if not symbols:
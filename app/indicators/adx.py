@@ -30,6 +30,8 @@ class ADX(Indicator):
     `compute()` requires `high` and `low` in addition to `close`.
     """
 
+    uses_high_low = True
+
     def __init__(self, period: int = 14) -> None:
         super().__init__()
         if period < 1:
@@ -42,6 +42,8 @@ class ATR(Indicator):
     stop multiple.
     """
 
+    uses_high_low = True
+
     def __init__(self, period: int = 14) -> None:
         super().__init__()
         if period < 1:
@@ -1,8 +1,66 @@
 from abc import ABC, abstractmethod
+import math
+import numpy as np
 import pandas as pd
 
+
+def bfill_fillna(values: np.ndarray, fill: float) -> np.ndarray:
+    """ndarray equivalent of `Series.bfill().fillna(fill)`."""
+    nan = np.isnan(values)
+    if not nan.any():
+        return values
+    n = len(values)
+    # For each slot, the position of the next non-NaN value (n if none).
+    nxt = np.where(nan, n, np.arange(n))
+    nxt = np.minimum.accumulate(nxt[::-1])[::-1]
+    return np.append(values, fill)[nxt]
+
+
+class EwmMean:
+    """
+    Streaming `Series.ewm(span=... | alpha=..., adjust=False).mean()`.
+
+    `update(x)` returns the next output of the same recursion pandas runs
+    (weight bookkeeping, `ignore_na=False` NaN handling, span -> com ->
+    alpha conversion), so a value fed bar by bar is bit-identical to the
+    last element of the batch ewm over the same history.
+    """
+
+    __slots__ = ("_decay", "_new_wt", "_old_wt", "value")
+
+    def __init__(self, span: float | None = None, alpha: float | None = None):
+        if alpha is None:
+            alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+        self._decay = 1.0 - alpha
+        self._new_wt = alpha
+        self._old_wt = 1.0
+        self.value = math.nan
+
+    def update(self, x: float) -> float:
+        w = self.value
+        if w == w:
+            self._old_wt *= self._decay
+            if x == x:
+                if w != x:
+                    w = (self._old_wt * w + self._new_wt * x) / (self._old_wt + self._new_wt)
+                self._old_wt = 1.0
+        elif x == x:
+            w = x
+        self.value = w
+        return w
+
+
 class Indicator(ABC):
     """Base class for all technical indicators"""
+
+    # Close-only indicators leave this False so callers can skip building
+    # high/low series they would never read.
+    uses_high_low: bool = False
+
+    # Indicators that can advance one bar at a time from a small state
+    # (`new_state`/`update`) set this, so the live monitor updates them in
+    # O(1) per bar instead of recomputing the whole window.
+    streams: bool = False
     
     def __init__(self):
         self.name = "indicator"
@@ -22,6 +80,35 @@ class Indicator(ABC):
             pd.Series: Indicator values
         """
         pass
+
+    def compute_array(self, close: np.ndarray, high: np.ndarray = None,
+                      low: np.ndarray = None) -> np.ndarray:
+        """
+        Same values as `compute`, on bare float64 arrays (no index).
+
+        The default round-trips through `compute`; indicators on the
+        live/backfill hot path override it with their ndarray core and
+        make `compute` the wrapper instead.
+        """
+        series = [None if a is None else pd.Series(a, dtype=np.float64) for a in (close, high, low)]
+        return self.compute(*series).to_numpy(dtype=np.float64)
+    
+    def new_state(self, history: np.ndarray = ()):
+        """Streaming state after replaying `history` (closes, oldest first)."""
+        state = self._empty_state()
+        for x in history:
+            self.update(state, float(x))
+        return state
+
+    def _empty_state(self):
+        raise NotImplementedError(f"{type(self).__name__} does not stream")
+
+    def update(self, state, close: float) -> float:
+        """
+        Advance `state` by one close and return the new value: the last
+        element `compute` would return on the history fed so far.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not stream")
     
     def __str__(self):
         return f"{self.name.upper()}(period={self.period})"
@@ -1,6 +1,15 @@
+from dataclasses import dataclass
+
 import pandas as pd
 import numpy as np
-from app.indicators.base import Indicator
+from app.indicators.base import EwmMean, Indicator, bfill_fillna
+
+
+@dataclass
+class MACDState:
+    """Streaming MACD-line state: the fast and slow EMAs of close."""
+    fast: EwmMean
+    slow: EwmMean
 
 class MACD(Indicator):
     """
@@ -53,6 +62,8 @@ class MACD(Indicator):
     - https://school.stockcharts.com/doku.php?id=technical_indicators:moving_average_convergence_divergence_macd
     """
     
+    streams = True
+    
     def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
         super().__init__()
         self.fast = fast
@@ -139,14 +150,21 @@ class MACD(Indicator):
         compute_signal() : Returns only the signal line
         compute_histogram() : Returns only the histogram
         """
+        return pd.Series(
+            self.compute_array(close.to_numpy(dtype=np.float64)), index=close.index, name=close.name
+        )
+
+    def compute_array(self, close: np.ndarray, high=None, low=None) -> np.ndarray:
+        """`compute` on a bare float64 array; the ndarray core it wraps."""
         # Step 1: Calculate fast EMA (12-period by default)
         # This EMA responds quickly to recent price changes
         # adjust=False ensures recursive calculation (standard MACD method)
-        ema_fast = close.ewm(span=self.fast, adjust=False).mean()
+        c = pd.Series(np.asarray(close, dtype=np.float64), copy=False)
+        ema_fast = c.ewm(span=self.fast, adjust=False).mean().to_numpy()
         
         # Step 2: Calculate slow EMA (26-period by default)
         # This EMA is smoother and less reactive to short-term fluctuations
-        ema_slow = close.ewm(span=self.slow, adjust=False).mean()
+        ema_slow = c.ewm(span=self.slow, adjust=False).mean().to_numpy()
         
         # Step 3: Calculate MACD line
         # MACD = Fast EMA - Slow EMA
@@ -158,7 +176,15 @@ class MACD(Indicator):
         # Step 4: Handle initial NaN values
         # First 'slow' periods will be NaN due to insufficient data
         # Backfill to get first valid value, then fill remaining with 0
-        return macd_line.bfill().fillna(0)
+        return bfill_fillna(macd_line, 0.0)
+    
+    def _empty_state(self) -> MACDState:
+        return MACDState(EwmMean(span=self.fast), EwmMean(span=self.slow))
+
+    def update(self, state: MACDState, close: float) -> float:
+        """One bar of the MACD line (O(1), no history)."""
+        line = state.fast.update(close) - state.slow.update(close)
+        return 0.0 if line != line else line
     
     def compute_signal(self, close: pd.Series) -> pd.Series:
         """
@@ -177,9 +203,7 @@ class MACD(Indicator):
             >>> macd = MACD()
             >>> signal = macd.compute_signal(df['close'])
         """
-        macd_line = self.compute(close)
-        signal_line = macd_line.ewm(span=self.signal, adjust=False).mean()
-        return signal_line.bfill().fillna(0)
+        return self.compute_full(close)[1]
     
     def compute_histogram(self, close: pd.Series) -> pd.Series:
         """
@@ -202,17 +226,15 @@ class MACD(Indicator):
             >>> # Find when histogram crosses above zero (buy signal)
             >>> buy_signals = (histogram > 0) & (histogram.shift(1) <= 0)
         """
-        macd_line = self.compute(close)
-        signal_line = self.compute_signal(close)
-        histogram = macd_line - signal_line
-        return histogram.bfill().fillna(0)
+        return self.compute_full(close)[2]
     
     def compute_full(self, close: pd.Series) -> tuple[pd.Series, pd.Series, pd.Series]:
         """
         Calculate all MACD components: line, signal, and histogram.
         
         This is the most efficient way to get all three components
-        as it only calculates EMAs once.
+        as it only calculates EMAs once; `compute_signal` and
+        `compute_histogram` are slices of it.
         
         Args:
             close (pd.Series): Series of closing prices
@@ -237,12 +259,14 @@ class MACD(Indicator):
             >>> plt.legend()
             >>> plt.show()
         """
-        macd_line = self.compute(close)
-        signal_line = macd_line.ewm(span=self.signal, adjust=False).mean()
-        histogram = macd_line - signal_line
+        line = self.compute_array(close.to_numpy(dtype=np.float64))
+        signal_line = bfill_fillna(
+            pd.Series(line, copy=False).ewm(span=self.signal, adjust=False).mean().to_numpy(), 0.0
+        )
+        histogram = bfill_fillna(line - signal_line, 0.0)
         
         return (
-            macd_line.bfill().fillna(0),
-            signal_line.bfill().fillna(0),
-            histogram.bfill().fillna(0)
+            pd.Series(line, index=close.index, name=close.name),
+            pd.Series(signal_line, index=close.index, name=close.name),
+            pd.Series(histogram, index=close.index, name=close.name),
         )
@@ -77,6 +77,7 @@ class PivotDetector(Indicator):
         self.period = period
         self.source = source
         self.strict = strict
+        self.uses_high_low = source == "hl"
 
     # -- registry surface ---------------------------------------------------
     def compute(self, close: pd.Series, high: Optional[pd.Series] = None,
@@ -41,6 +41,8 @@ class StochasticOscillator(Indicator):
       - `d_period`: smoothing for %D over %K (typical: 3).
     """
 
+    uses_high_low = True
+
     def __init__(
         self,
         period: int = 14,
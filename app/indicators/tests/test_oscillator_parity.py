@@ -0,0 +1,109 @@
+"""RSI/TSI/MACD ndarray pipelines must match the original Series formulations bit-for-bit."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.indicators.base import EwmMean, bfill_fillna
+from app.indicators.macd import MACD
+from app.indicators.rsi import RSI
+from app.indicators.tsi import TSI
+
+
+def _close(n: int, seed: int = 11) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2026-01-05 14:30", periods=n, freq="1min", tz="UTC")
+    s = pd.Series((100 + np.cumsum(rng.normal(0, 0.3, n))).round(1), index=idx)
+    if n > 30:
+        s.iloc[20:23] = np.nan  # gaps and flat runs exercise the 0/NaN paths
+    return s
+
+
+def _rsi_reference(close: pd.Series, period: int) -> pd.Series:
+    delta = close.diff()
+    gain = pd.Series(np.where(delta > 0, delta, 0.0), index=close.index)
+    loss = pd.Series(np.where(delta < 0, -delta, 0.0), index=close.index)
+    rs = gain.ewm(span=period, adjust=False).mean() / (
+        loss.ewm(span=period, adjust=False).mean().replace(0, np.nan)
+    )
+    return (100 - (100 / (1 + rs))).bfill().fillna(50)
+
+
+def _tsi_reference(close: pd.Series, long: int, short: int) -> pd.Series:
+    m = close.diff()
+    num = m.ewm(span=long, adjust=False).mean().ewm(span=short, adjust=False).mean()
+    den = m.abs().ewm(span=long, adjust=False).mean().ewm(span=short, adjust=False).mean()
+    return (100 * (num / den.replace(0, np.nan))).bfill().fillna(0)
+
+
+def _macd_reference(close: pd.Series, fast: int, slow: int, signal: int):
+    line = (close.ewm(span=fast, adjust=False).mean()
+            - close.ewm(span=slow, adjust=False).mean()).bfill().fillna(0)
+    sig = line.ewm(span=signal, adjust=False).mean()
+    return line, sig.bfill().fillna(0), (line - sig).bfill().fillna(0)
+
+
+@pytest.mark.parametrize("n", [0, 1, 5, 400])
+def test_rsi_matches_reference(n):
+    close = _close(n)
+    pd.testing.assert_series_equal(RSI(14).compute(close), _rsi_reference(close, 14), check_exact=True)
+
+
+@pytest.mark.parametrize("n", [0, 1, 5, 400])
+def test_tsi_matches_reference(n):
+    close = _close(n)
+    pd.testing.assert_series_equal(TSI(25, 13).compute(close), _tsi_reference(close, 25, 13), check_exact=True)
+
+
+@pytest.mark.parametrize("n", [0, 1, 5, 400])
+def test_macd_matches_reference(n):
+    close, m = _close(n), MACD(12, 26, 9)
+    line, sig, hist = _macd_reference(close, 12, 26, 9)
+    pd.testing.assert_series_equal(m.compute(close), line, check_exact=True)
+    for got, want in zip(m.compute_full(close), (line, sig, hist)):
+        pd.testing.assert_series_equal(got, want, check_exact=True)
+    pd.testing.assert_series_equal(m.compute_signal(close), sig, check_exact=True)
+    pd.testing.assert_series_equal(m.compute_histogram(close), hist, check_exact=True)
+
+
+@pytest.mark.parametrize("ind", [RSI(14), TSI(25, 13), MACD()], ids=str)
+def test_compute_array_matches_compute(ind):
+    close = _close(400)
+    got = ind.compute_array(close.to_numpy())
+    np.testing.assert_array_equal(got, ind.compute(close).to_numpy())
+
+
+def test_bfill_fillna_matches_pandas():
+    rng = np.random.default_rng(2)
+    for _ in range(50):
+        v = rng.normal(size=int(rng.integers(0, 30)))
+        v[rng.random(len(v)) < 0.4] = np.nan
+        want = pd.Series(v).bfill().fillna(7.0).to_numpy()
+        np.testing.assert_array_equal(bfill_fillna(v, 7.0), want)
+
+
+def test_divergence_indicators_are_close_only() -> None:
+    # The live monitor and backfill skip high/low for these; if one starts
+    # needing them it must flip `uses_high_low`.
+    from app.services.live.monitor_service import INDICATOR_MAP
+
+    assert not any(cls.uses_high_low for cls in INDICATOR_MAP.values())
+
+
+@pytest.mark.parametrize("kw", [{"span": 14}, {"span": 2}, {"alpha": 1 / 14}], ids=str)
+def test_ewm_mean_streams_pandas_recursion(kw):
+    v = _close(120).diff().to_numpy()
+    e = EwmMean(**kw)
+    got = [e.update(x) for x in v]
+    want = pd.Series(v).ewm(adjust=False, **kw).mean().to_numpy()
+    np.testing.assert_array_equal(got, want)
+
+
+@pytest.mark.parametrize("ind", [RSI(14), TSI(25, 13), MACD()], ids=str)
+def test_update_matches_compute_array_tail(ind):
+    close = _close(120).to_numpy(copy=True)
+    close[40:50] = close[39]  # flat run
+    state = ind.new_state(close[:60])
+    for i in range(60, len(close)):
+        assert ind.update(state, close[i]) == ind.compute_array(close[:i + 1])[-1]
@@ -1,6 +1,19 @@
+import math
+from dataclasses import dataclass
+
 import pandas as pd
 import numpy as np
-from app.indicators.base import Indicator
+from app.indicators.base import EwmMean, Indicator, bfill_fillna
+
+
+@dataclass
+class TSIState:
+    """Streaming TSI state: last close plus the four EMA stages."""
+    m_long: EwmMean
+    m_short: EwmMean
+    a_long: EwmMean
+    a_short: EwmMean
+    prev: float = math.nan
 
 class TSI(Indicator):
     """
@@ -43,6 +56,8 @@ class TSI(Indicator):
     - https://school.stockcharts.com/doku.php?id=technical_indicators:true_strength_index
     """
     
+    streams = True
+    
     def __init__(self, long: int = 25, short: int = 13):
         super().__init__()
         self.long = long
@@ -120,51 +135,59 @@ class TSI(Indicator):
         - Overbought: TSI > +25 (consider taking profits)
         - Oversold: TSI < -25 (consider buying opportunity)
         """
+        return pd.Series(self.compute_array(close.to_numpy(dtype=np.float64)), index=close.index)
+
+    def compute_array(self, close: np.ndarray, high=None, low=None) -> np.ndarray:
+        """`compute` on a bare float64 array; the ndarray core it wraps."""
+        # Momentum and |momentum| go through the same two EMAs, so they
+        # are smoothed together as one two-column frame (two ewm passes
+        # instead of four, no intermediate Series); pandas' recursion
+        # per column is unchanged, so values are bit-identical.
+        
         # Step 1: Calculate price momentum (change in price)
         # momentum[i] = close[i] - close[i-1]
-        momentum = close.diff()
+        c = np.asarray(close, dtype=np.float64)
+        momentum = np.empty_like(c)
+        momentum[:1] = np.nan
+        momentum[1:] = c[1:] - c[:-1]
         
         # Step 2: Calculate absolute momentum for normalization
         # abs_momentum[i] = |momentum[i]|
-        abs_momentum = momentum.abs()
-        
-        # Step 3: Apply first EMA to momentum (long period smoothing)
-        # This reduces short-term noise and volatility
-        ema1_momentum = momentum.ewm(
-            span=self.long,
-            adjust=False  # Use recursive calculation for consistency
-        ).mean()
-        
-        # Step 4: Apply second EMA to first smoothed momentum (short period)
-        # This is the "double smoothing" that makes TSI unique
-        # Results in a very smooth momentum measure
-        ema2_momentum = ema1_momentum.ewm(
-            span=self.short,
-            adjust=False
-        ).mean()
-        
-        # Step 5: Apply first EMA to absolute momentum (long period)
-        # Same smoothing process but on absolute values for normalization
-        ema1_abs_momentum = abs_momentum.ewm(
-            span=self.long,
-            adjust=False
-        ).mean()
-        
-        # Step 6: Apply second EMA to first smoothed absolute momentum (short period)
-        # Double smoothing of absolute momentum for normalization denominator
-        ema2_abs_momentum = ema1_abs_momentum.ewm(
-            span=self.short,
-            adjust=False
-        ).mean()
+        abs_momentum = np.abs(momentum)
+        
+        # Steps 3-6: First EMA (long period) reduces short-term noise;
+        # second EMA (short period) is the "double smoothing" that makes
+        # TSI unique. Applied to momentum (numerator) and absolute
+        # momentum (normalization denominator) alike.
+        smoothed = (
+            pd.DataFrame(np.column_stack((momentum, abs_momentum)))
+            .ewm(span=self.long, adjust=False).mean()   # recursive, for consistency
+            .ewm(span=self.short, adjust=False).mean()
+            .to_numpy()
+        )
+        ema2_momentum, ema2_abs_momentum = smoothed[:, 0], smoothed[:, 1]
         
         # Step 7: Calculate TSI by normalizing double-smoothed momentum
         # TSI = 100 × (Double Smoothed Momentum / Double Smoothed Absolute Momentum)
         # Multiplied by 100 to scale to percentage-like values
         # Replace 0 with NaN to avoid division by zero
-        tsi = 100 * (ema2_momentum / ema2_abs_momentum.replace(0, np.nan))
+        tsi = 100 * (ema2_momentum / np.where(ema2_abs_momentum == 0, np.nan, ema2_abs_momentum))
         
         # Step 8: Handle NaN values
         # - Initial values are NaN due to insufficient data for double smoothing
         # - Set to 0 (neutral momentum) rather than backfilling
         # - This is more appropriate for TSI as it represents "no momentum" state
-        return tsi.bfill().fillna(0)
\ No newline at end of file
+        return bfill_fillna(tsi, 0.0)
+
+    def _empty_state(self) -> TSIState:
+        return TSIState(EwmMean(span=self.long), EwmMean(span=self.short),
+                        EwmMean(span=self.long), EwmMean(span=self.short))
+
+    def update(self, state: TSIState, close: float) -> float:
+        """One bar of `compute_array`'s double smoothing (O(1), no history)."""
+        momentum = close - state.prev
+        state.prev = close
+        num = state.m_short.update(state.m_long.update(momentum))
+        den = state.a_short.update(state.a_long.update(abs(momentum)))
+        tsi = 100 * (num / (math.nan if den == 0 else den))
+        return 0.0 if math.isnan(tsi) else tsi
@@ -4,6 +4,7 @@ FastAPI Application - Stock Divergence Alert System
 Provides REST API and WebSocket endpoints for real-time divergence detection.
 """
 import asyncio
+import json
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -73,7 +74,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-active_connections = []
+active_connections: set[WebSocket] = set()
 
 
 async def _safe_start(label: str, coro_factory):
@@ -685,16 +686,19 @@ async def lifespan(app: FastAPI):
 
     async def broadcast_signal(signal_data: dict):
         logger.info(f"📡 Broadcasting signal: {signal_data}")
-        disconnected = []
-        for ws in active_connections:
-            try:
-                await ws.send_json(signal_data)
-            except Exception as e:
-                logger.warning(f"Failed to send to WebSocket: {e}")
-                disconnected.append(ws)
-        for ws in disconnected:
-            if ws in active_connections:
-                active_connections.remove(ws)
+        # Encode once (same text frame send_json would build per client),
+        # then send to every client concurrently so one slow socket doesn't
+        # hold up the rest; a failed send drops that client.
+        payload = json.dumps(signal_data, separators=(",", ":"), ensure_ascii=False)
+        targets = tuple(active_connections)
+        results = await asyncio.gather(
+            *(ws.send_text(payload) for ws in targets),
+            return_exceptions=True,
+        )
+        for ws, result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to send to WebSocket: {result}")
+                active_connections.discard(ws)
 
     # ── Job registry ──────────────────────────────────────────────────
     # Register each background loop with the JobRegistry so the cockpit
@@ -1087,12 +1091,11 @@ async def health():
 @app.websocket("/ws/signals")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    active_connections.append(websocket)
+    active_connections.add(websocket)
     logger.info(f"WebSocket connected. Total: {len(active_connections)}")
     try:
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
-        if websocket in active_connections:
-            active_connections.remove(websocket)
+        active_connections.discard(websocket)
         logger.info(f"WebSocket disconnected. Total: {len(active_connections)}")
@@ -142,7 +142,7 @@ class _FakeProvider:
 
 
 def test_call_get_movers() -> None:
-    with patch("app.mcp.tools.movers.get_provider", return_value=_FakeProvider()):
+    with patch("app.mcp.tools.movers.get_shared_provider", return_value=_FakeProvider()):
         body = _unwrap(asyncio.run(mcp.call_tool("get_movers", {"symbol_id": "$SPX"})))
     payload = body.get("result", body)
     assert "screeners" in payload
@@ -151,14 +151,14 @@ def test_call_get_movers() -> None:
 
 def test_call_get_movers_provider_missing_returns_empty() -> None:
     class _Bare: pass
-    with patch("app.mcp.tools.movers.get_provider", return_value=_Bare()):
+    with patch("app.mcp.tools.movers.get_shared_provider", return_value=_Bare()):
         body = _unwrap(asyncio.run(mcp.call_tool("get_movers", {"symbol_id": "$SPX"})))
     payload = body.get("result", body)
     assert payload == {}
 
 
 def test_call_search_instrument() -> None:
-    with patch("app.mcp.tools.instruments.get_provider", return_value=_FakeProvider()):
+    with patch("app.mcp.tools.instruments.get_shared_provider", return_value=_FakeProvider()):
         body = _unwrap(asyncio.run(mcp.call_tool(
             "search_instrument", {"query": "apple", "limit": 5}
         )))
@@ -167,7 +167,7 @@ def test_call_search_instrument() -> None:
 
 
 def test_call_get_instruments() -> None:
-    with patch("app.mcp.tools.instruments.get_provider", return_value=_FakeProvider()):
+    with patch("app.mcp.tools.instruments.get_shared_provider", return_value=_FakeProvider()):
         body = _unwrap(asyncio.run(mcp.call_tool(
             "get_instruments", {"symbols": ["AAPL", "MSFT"]}
         )))
@@ -177,7 +177,7 @@ def test_call_get_instruments() -> None:
 
 
 def test_call_get_market_hours() -> None:
-    with patch("app.mcp.tools.market.get_provider", return_value=_FakeProvider()):
+    with patch("app.mcp.tools.market.get_shared_provider", return_value=_FakeProvider()):
         body = _unwrap(asyncio.run(mcp.call_tool("get_market_hours", {})))
     payload = body.get("result", body)
     assert "equity" in payload
@@ -11,7 +11,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Optional
 
-from app.config import get_provider
+from app.config import get_shared_provider
 from app.mcp.middleware import tool_call
 from app.mcp.server import mcp
 
@@ -42,7 +42,7 @@ async def search_instrument(query: str, limit: int = 10) -> list[dict[str, Any]]
     Don't loop this — for known tickers use `get_instrument` instead.
     """
     with tool_call("search_instrument", query=query, limit=limit):
-        provider = get_provider()
+        provider = get_shared_provider()
         searcher = getattr(provider, "search_instruments", None)
         if searcher is None:
             return []
@@ -83,7 +83,7 @@ async def get_instruments(
     (degraded mode).
     """
     with tool_call("get_instruments", symbol_count=len(symbols), projection=projection):
-        provider = get_provider()
+        provider = get_shared_provider()
         getter = getattr(provider, "get_instruments", None)
         if getter is None:
             return {}
@@ -12,7 +12,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Optional
 
-from app.config import get_provider
+from app.config import get_shared_provider
 from app.mcp.middleware import tool_call
 from app.mcp.server import mcp
 
@@ -42,7 +42,7 @@ async def get_market_hours(market: Optional[str] = None) -> dict[str, Any]:
         Empty dict on provider error.
     """
     with tool_call("get_market_hours", market=market):
-        provider = get_provider()
+        provider = get_shared_provider()
         getter = getattr(provider, "get_market_hours", None)
         if getter is None:
             return {}
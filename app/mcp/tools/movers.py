@@ -12,7 +12,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Optional
 
-from app.config import get_provider
+from app.config import get_shared_provider
 from app.mcp.middleware import tool_call
 from app.mcp.server import mcp
 
@@ -51,7 +51,7 @@ async def get_movers(
     Schwab token expiry surfaces as `{}` rather than an exception.
     """
     with tool_call("get_movers", symbol_id=symbol_id, sort=sort, frequency=frequency):
-        provider = get_provider()
+        provider = get_shared_provider()
         getter = getattr(provider, "get_movers", None)
         if getter is None:
             logger.warning("get_movers: active provider has no get_movers method")
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import threading
+from collections import deque
 from datetime import datetime
 
 import pandas as pd
@@ -20,6 +21,16 @@ class AlpacaProvider(DataProvider):
         self._thread = None
         self._started = False
         self._main_loop = None
+        # Bars cross from Alpaca's stream thread to the main loop through
+        # this deque; one drain task on the main loop starts the callbacks.
+        # A wakeup is only scheduled when the drain isn't already pending,
+        # so a burst of bars costs one cross-thread hop, not one each.
+        self._bar_queue = deque()
+        self._wake = None
+        self._wake_pending = False
+        self._drain_task = None
+        # Strong refs to running callbacks (the loop only keeps weak ones).
+        self._callbacks: set[asyncio.Task] = set()
 
     def start_stream(self):
         """Start stream in separate thread"""
@@ -51,10 +62,40 @@ class AlpacaProvider(DataProvider):
         except Exception as e:
             logger.error(f"Error stopping stream: {e}")
         finally:
+            if self._drain_task is not None and self._main_loop is not None:
+                self._main_loop.call_soon_threadsafe(self._drain_task.cancel)
+            self._drain_task = None
             self._started = False
             self._main_loop = None
             logger.info("✅ Alpaca stream stopped")
 
+    async def _drain(self):
+        """Start queued (callback, bar) pairs on the main loop, in arrival order.
+
+        Each callback gets its own task, as when every bar crossed with
+        run_coroutine_threadsafe, so a slow one (a broadcast, a batch
+        insert) doesn't hold up other symbols' bars.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            # Cleared before draining: a bar appended after this point
+            # schedules a fresh wakeup, one appended before is drained now.
+            self._wake_pending = False
+            while self._bar_queue:
+                callback, bar = self._bar_queue.popleft()
+                task = loop.create_task(self._run_callback(callback, bar))
+                self._callbacks.add(task)
+                task.add_done_callback(self._callbacks.discard)
+
+    @staticmethod
+    async def _run_callback(callback, bar):
+        try:
+            await callback(bar)
+        except Exception as e:
+            logger.error(f"Error in bar callback: {e}", exc_info=True)
+
     def subscribe_bars(self, callback, tickers: list[str]):
         """
         Subscribe to bar updates.
@@ -76,6 +117,14 @@ class AlpacaProvider(DataProvider):
             except RuntimeError:
                 logger.error("❌ No event loop running! Call from async context.")
                 return
+        if self._drain_task is None or self._drain_task.done():
+            # A drain cancelled by stop_stream can leave a wakeup marked
+            # pending (nothing would ever set the new Event) and bars from
+            # the stopped stream queued for stale callbacks: reset both.
+            self._bar_queue.clear()
+            self._wake_pending = False
+            self._wake = asyncio.Event()
+            self._drain_task = self._main_loop.create_task(self._drain())
         
         # Create async handler that bridges to main loop
         async def alpaca_handler(bar):
@@ -83,12 +132,13 @@ class AlpacaProvider(DataProvider):
             This runs in Alpaca's thread/loop.
             Bridge the callback to the main application loop.
             """
-            if self._main_loop and not self._main_loop.is_closed():
-                # Schedule callback in main loop from Alpaca's thread
-                asyncio.run_coroutine_threadsafe(
-                    callback(bar),
-                    self._main_loop
-                )
+            loop = self._main_loop
+            if loop and not loop.is_closed():
+                # Hand the bar to the main loop's drain task
+                self._bar_queue.append((callback, bar))
+                if not self._wake_pending:
+                    self._wake_pending = True
+                    loop.call_soon_threadsafe(self._wake.set)
             else:
                 logger.error("❌ Main event loop not available!")
         
@@ -115,6 +165,28 @@ class AlpacaProvider(DataProvider):
             except Exception as e:
                 logger.debug(f"Error unsubscribing {ticker}: {e}")
 
+    @staticmethod
+    def _timeframe(timeframe: str) -> TimeFrame:
+        return (
+            TimeFrame(1, TimeFrameUnit.Minute)
+            if timeframe == "1Min"
+            else TimeFrame(1, TimeFrameUnit.Day)
+        )
+
+    async def _get_bars(self, symbol_or_symbols, start, end, timeframe) -> dict:
+        request = StockBarsRequest(
+            symbol_or_symbols=symbol_or_symbols,
+            timeframe=self._timeframe(timeframe),
+            start=start,
+            end=end
+        )
+        
+        # Run the synchronous API call off the event loop
+        bars_set = await asyncio.to_thread(self._hist.get_stock_bars, request)
+        
+        # Access the data dictionary from BarSet
+        return bars_set.data
+
     async def historical_df(
         self,
         symbol: str,
@@ -123,50 +195,49 @@ class AlpacaProvider(DataProvider):
         timeframe: str = "1Min"
     ) -> pd.DataFrame:
         """Fetch historical data and return as DataFrame"""
-        request = StockBarsRequest(
-            symbol_or_symbols=symbol,
-            timeframe=(
-                TimeFrame(1, TimeFrameUnit.Minute)
-                if timeframe == "1Min"
-                else TimeFrame(1, TimeFrameUnit.Day)
-            ),
-            start=start,
-            end=end
-        )
-        
-        # Run the synchronous API call in an executor to avoid blocking
-        loop = asyncio.get_event_loop()
-        bars_set = await loop.run_in_executor(None, self._hist.get_stock_bars, request)
-        
-        # Access the data dictionary from BarSet
-        bars_dict = bars_set.data
-        
-        # Get bars for the symbol
-        if symbol not in bars_dict:
-            return pd.DataFrame()
-        
-        bars = bars_dict[symbol]
-        
+        bars_dict = await self._get_bars(symbol, start, end, timeframe)
+        return self._bars_frame(bars_dict.get(symbol))
+
+    async def historical_df_multi(
+        self,
+        symbols: list[str],
+        start: datetime,
+        end: datetime,
+        timeframe: str = "1Min"
+    ) -> dict[str, pd.DataFrame]:
+        """Fetch several symbols in one request; {symbol: DataFrame}."""
+        if not symbols:
+            return {}
+        bars_dict = await self._get_bars(list(symbols), start, end, timeframe)
+        return {symbol: self._bars_frame(bars_dict.get(symbol)) for symbol in symbols}
+
+    @staticmethod
+    def _bars_frame(bars) -> pd.DataFrame:
+        """One symbol's Alpaca bars as a timestamp-indexed DataFrame."""
         if not bars:
             return pd.DataFrame()
         
-        # Convert to DataFrame
-        data = []
+        # Convert to DataFrame column-wise: one pass over the bars into
+        # per-field lists (optional fields resolved once, not per bar),
+        # no per-row dicts for pandas to consolidate.
+        has_vwap = hasattr(bars[0], 'vwap')
+        has_trade_count = hasattr(bars[0], 'trade_count')
+        cols = {f: [] for f in ('open', 'high', 'low', 'close', 'volume')}
+        ts, vwap, trade_count = [], [], []
         for bar in bars:
-            data.append({
-                'timestamp': bar.timestamp,
-                'open': bar.open,
-                'high': bar.high,
-                'low': bar.low,
-                'close': bar.close,
-                'volume': bar.volume,
-                'vwap': bar.vwap if hasattr(bar, 'vwap') else None,
-                'trade_count': bar.trade_count if hasattr(bar, 'trade_count') else None
-            })
-        
-        df = pd.DataFrame(data)
-        if not df.empty:
-            df.set_index('timestamp', inplace=True)
+            ts.append(bar.timestamp)
+            cols['open'].append(bar.open)
+            cols['high'].append(bar.high)
+            cols['low'].append(bar.low)
+            cols['close'].append(bar.close)
+            cols['volume'].append(bar.volume)
+            vwap.append(bar.vwap if has_vwap else None)
+            trade_count.append(bar.trade_count if has_trade_count else None)
+        cols['vwap'] = vwap
+        cols['trade_count'] = trade_count
+        
+        df = pd.DataFrame(cols, index=pd.DatetimeIndex(ts, name='timestamp'))
+        if not df.index.is_monotonic_increasing:  # Alpaca returns bars in time order
             df.sort_index(inplace=True)
         
-        return df
\ No newline at end of file
+        return df
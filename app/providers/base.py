@@ -13,6 +13,24 @@ class DataProvider(ABC):
     @abstractmethod
     async def historical_df(self, symbol: str, start, end, timeframe: str="1Min") -> pd.DataFrame: ...
 
+    async def historical_df_multi(
+        self, symbols: list[str], start, end, timeframe: str = "1Min"
+    ) -> dict[str, pd.DataFrame]:
+        """
+        `historical_df` for several symbols, keyed by symbol (empty frame when
+        a symbol has no bars).
+
+        Default implementation issues one `historical_df` per symbol
+        concurrently. Providers whose API takes a symbol list (e.g.
+        AlpacaProvider) override this with a single request.
+        """
+        import asyncio
+
+        frames = await asyncio.gather(
+            *(self.historical_df(s, start, end, timeframe=timeframe) for s in symbols)
+        )
+        return dict(zip(symbols, frames))
+
     async def search_instruments(self, query: str, *, limit: int = 10) -> list[dict]:
         """
         Symbol autocomplete. Returns a list of `{symbol, description, exchange,
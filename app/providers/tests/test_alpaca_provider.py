@@ -0,0 +1,150 @@
+"""
+Unit tests for AlpacaProvider.historical_df (BarSet -> DataFrame).
+
+`get_stock_bars` is replaced with a stub returning duck-typed bars, so no
+network or credentials are needed.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+
+from app.providers.alpaca_provider import AlpacaProvider
+
+T0 = datetime(2026, 3, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def _provider(bars: dict) -> AlpacaProvider:
+    p = AlpacaProvider.__new__(AlpacaProvider)  # skip client construction
+    p._hist = SimpleNamespace(get_stock_bars=lambda _req: SimpleNamespace(data=bars))
+    return p
+
+
+def _bar(i: int) -> SimpleNamespace:
+    return SimpleNamespace(timestamp=T0 + timedelta(minutes=i), open=1.0 + i, high=2.0,
+                           low=0.5, close=1.5, volume=100.0 * i, vwap=1.25, trade_count=3)
+
+
+def test_historical_df_columns_sorted_utc_index() -> None:
+    bars = [_bar(i) for i in (2, 0, 1)]
+    df = asyncio.run(_provider({"AAPL": bars}).historical_df("AAPL", T0, T0 + timedelta(hours=1)))
+
+    # Same frame the old list-of-dicts construction produced
+    want = pd.DataFrame([vars(b) for b in bars]).set_index("timestamp").sort_index()
+    pd.testing.assert_frame_equal(df, want)
+    assert str(df.index.tz) == "UTC" and df.index.name == "timestamp"
+    assert df["open"].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_historical_df_missing_symbol_is_empty() -> None:
+    assert asyncio.run(_provider({}).historical_df("MSFT", T0, T0)).empty
+
+
+def test_historical_df_multi_single_request() -> None:
+    p = _provider({"AAPL": [_bar(0), _bar(1)], "MSFT": [_bar(2)]})
+    requests = []
+    get = p._hist.get_stock_bars
+    p._hist.get_stock_bars = lambda req: requests.append(req) or get(req)
+
+    got = asyncio.run(p.historical_df_multi(["AAPL", "MSFT", "TSLA"], T0, T0 + timedelta(hours=1)))
+
+    assert len(requests) == 1 and requests[0].symbol_or_symbols == ["AAPL", "MSFT", "TSLA"]
+    assert [len(got[s]) for s in ("AAPL", "MSFT", "TSLA")] == [2, 1, 0]
+    pd.testing.assert_frame_equal(got["AAPL"], asyncio.run(p.historical_df("AAPL", T0, T0)))
+
+
+def test_stream_bars_reach_main_loop_in_order() -> None:
+    handlers = {}
+    with patch("app.providers.alpaca_provider.StockDataStream"), \
+            patch("app.providers.alpaca_provider.StockHistoricalDataClient"):
+        p = AlpacaProvider("key", "secret")
+    p._stream = SimpleNamespace(subscribe_bars=lambda h, t: handlers.__setitem__(t, h))
+    p._started = True  # start_stream() becomes a no-op
+    got = []
+
+    async def _cb(bar):
+        got.append((bar, threading.get_ident()))
+
+    async def _run():
+        p.subscribe_bars(_cb, ["AAPL"])
+        # Alpaca calls the handler on its own thread + loop
+        t = threading.Thread(target=lambda: [asyncio.run(handlers["AAPL"](i)) for i in range(200)])
+        t.start()
+        while len(got) < 200:
+            await asyncio.sleep(0.001)
+        t.join()
+        return threading.get_ident()
+
+    main_thread = asyncio.run(_run())
+    assert [b for b, _ in got] == list(range(200))
+    assert {tid for _, tid in got} == {main_thread}
+
+
+def _streaming_provider(handlers: dict) -> AlpacaProvider:
+    with patch("app.providers.alpaca_provider.StockDataStream"), \
+            patch("app.providers.alpaca_provider.StockHistoricalDataClient"):
+        p = AlpacaProvider("key", "secret")
+    p._stream = SimpleNamespace(subscribe_bars=lambda h, t: handlers.__setitem__(t, h),
+                                stop=lambda: None)
+    p._started = True  # start_stream() becomes a no-op
+    return p
+
+
+def test_stream_resubscribe_after_stop_with_wakeup_pending() -> None:
+    handlers = {}
+    p = _streaming_provider(handlers)
+    got = []
+
+    async def _cb(bar):
+        got.append(bar)
+
+    async def _run():
+        p.subscribe_bars(_cb, ["AAPL"])
+        p._bar_queue.append((_cb, "stale"))  # queued, wakeup not yet delivered
+        p._wake_pending = True
+        p.stop_stream()
+        await asyncio.sleep(0)
+        p._started = True
+        p.subscribe_bars(_cb, ["AAPL"])
+        await handlers["AAPL"]("fresh")
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+    asyncio.run(_run())
+    assert got == ["fresh"]
+    assert not p._bar_queue
+
+
+def test_stream_slow_callback_does_not_hold_other_bars() -> None:
+    handlers = {}
+    p = _streaming_provider(handlers)
+    release = None
+    got = []
+
+    async def _slow(bar):
+        await release.wait()
+        got.append(bar)
+
+    async def _fast(bar):
+        got.append(bar)
+
+    async def _run():
+        nonlocal release
+        release = asyncio.Event()
+        p.subscribe_bars(_slow, ["AAPL"])
+        p.subscribe_bars(_fast, ["MSFT"])
+        await handlers["AAPL"]("aapl")
+        await handlers["MSFT"]("msft")
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert got == ["msft"]
+        release.set()
+        await asyncio.gather(*p._callbacks)
+
+    asyncio.run(_run())
+    assert got == ["msft", "aapl"]
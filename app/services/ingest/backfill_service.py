@@ -913,7 +913,7 @@ class BackfillService:
     async def _fetch_and_persist_range(self, symbol: str, start: datetime, end: datetime) -> int:
         """
         Fetch directly from the provider over `[start, end]` and persist via
-        `queries.insert_bars_batch_async`. Bypasses `HistoricalDataLoader`'s
+        `queries.insert_bars_frame_async`. Bypasses `HistoricalDataLoader`'s
         DB-first short-circuit so backfill always reaches the provider.
         Returns the number of bars written.
         """
@@ -931,30 +931,12 @@ class BackfillService:
 
     async def _persist(self, symbol: str, df: pd.DataFrame) -> None:
         """Insert provider-fetched 1-min bars into ClickHouse, deduped on insert."""
-        src = self._history_source_tag()
-        records: list[dict] = []
-        for ts, row in df.iterrows():
-            if ts.tzinfo is None:
-                ts = ts.replace(tzinfo=timezone.utc)
-            records.append(
-                {
-                    "symbol": symbol.upper(),
-                    "timestamp": ts,
-                    "open": float(row["open"]),
-                    "high": float(row["high"]),
-                    "low": float(row["low"]),
-                    "close": float(row["close"]),
-                    "volume": float(row["volume"]),
-                    "vwap": float(row.get("vwap", 0) or 0),
-                    "trade_count": int(row.get("trade_count", 0) or 0),
-                    "source": src,
-                }
-            )
-        # Insert in 1k-row chunks to keep memory bounded and writes responsive.
-        BATCH = 1000
-        for i in range(0, len(records), BATCH):
-            await queries.insert_bars_batch_async(records[i : i + BATCH])
-        logger.info("Backfill %s: persisted %d bars", symbol, len(records))
+        # One column-oriented insert straight from the frame's arrays (no
+        # per-row Series/dicts); NaN vwap/trade_count land as 0.
+        n = await queries.insert_bars_frame_async(
+            symbol.upper(), df, source=self._history_source_tag()
+        )
+        logger.info("Backfill %s: persisted %d bars", symbol, n)
 
 
 # Singleton (constructed once per process; safe to import early because the
@@ -5,7 +5,10 @@ Handles loading historical price data with multiple sources and fallback logic.
 """
 import logging
 import asyncio
+import os
+import threading
 import pandas as pd
+from pyarrow import feather
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
@@ -16,6 +19,25 @@ from app.db import queries
 
 logger = logging.getLogger(__name__)
 
+_PARQUET_ROW_GROUP = 10_000
+_FETCH_TIMEOUT = 30.0  # seconds of provider time per symbol
+_MULTI_CHUNK = 10  # symbols per historical_df_multi request
+
+# One lock per symbol cache dir, process-wide: background saves run on worker
+# threads, and two merges of the same month would each drop the other's bars.
+_MERGE_LOCKS: dict[Path, threading.Lock] = {}
+
+
+def _write_atomic(path: Path, write) -> None:
+    """`write(tmp)` to a sibling temp file, then rename it over `path`, so
+    a reader never sees a half-written month file."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
 
 def _source_tag() -> str:
     # HistoricalDataLoader only ever loads from the history-role provider, so
@@ -26,6 +48,21 @@ def _source_tag() -> str:
     return tag if tag else settings.effective_history_provider
 
 
+def _combine(*frames: pd.DataFrame) -> pd.DataFrame:
+    """Concatenate bar frames into one sorted frame (later frames win on overlap)."""
+    frames = [f for f in frames if not f.empty]
+    if len(frames) <= 1:
+        return frames[0] if frames else pd.DataFrame()
+    df = pd.concat(frames)
+    df = df[~df.index.duplicated(keep="last")]
+    return df if df.index.is_monotonic_increasing else df.sort_index()
+
+
+def _enough(df: pd.DataFrame, limit: Optional[int]) -> bool:
+    """Whether `df` satisfies a load without going to the provider."""
+    return not df.empty and len(df) >= (limit or 0) * 0.8
+
+
 class HistoricalDataLoader:
     """
     Loads historical price data with intelligent fallback logic.
@@ -43,7 +80,7 @@ class HistoricalDataLoader:
         use_parquet_cache: Optional[bool] = None
     ):
         self.provider = provider
-        self.parquet_dir = parquet_dir or Path("data/parquet")
+        self.parquet_dir = parquet_dir or Path(settings.parquet_cache_dir)
         self.use_parquet_cache = (
             use_parquet_cache if use_parquet_cache is not None
             else getattr(settings, 'use_parquet_cache', False)
@@ -52,6 +89,15 @@ class HistoricalDataLoader:
         if self.use_parquet_cache:
             self.parquet_dir.mkdir(parents=True, exist_ok=True)
 
+        # Per symbol, a span the provider returned no bars for that lies
+        # entirely before today (UTC): pre-listing history, closed sessions.
+        # It can't gain bars later, so windows inside it are not re-requested.
+        # Containment, not exact keys: `_window` slides with the clock.
+        self._known_empty: dict[str, tuple[datetime, datetime]] = {}
+
+        # Strong refs to in-flight background saves (the loop only keeps weak ones).
+        self._saves: set[asyncio.Task] = set()
+
     async def load_bars(
         self,
         symbol: str,
@@ -75,14 +121,7 @@ class HistoricalDataLoader:
         Returns:
             DataFrame with columns: timestamp, open, high, low, close, volume
         """
-        if end is None:
-            end = datetime.now(timezone.utc)
-
-        if start is None:
-            if days_lookback:
-                start = end - timedelta(days=days_lookback)
-            else:
-                start = end - timedelta(days=30)
+        start, end = self._window(start, end, days_lookback)
 
         logger.info(
             f"Loading {symbol} [{purpose}]: {start.date()} to {end.date()} "
@@ -90,7 +129,7 @@ class HistoricalDataLoader:
         )
 
         df = await self._load_from_database(symbol, limit or 10000, start, end)
-        if not df.empty and len(df) >= (limit or 0) * 0.8:
+        if _enough(df, limit):
             logger.info(f"✅ Database: {len(df)} bars")
             return df
 
@@ -99,23 +138,135 @@ class HistoricalDataLoader:
                 f"⚠️  Database: Only {len(df)}/{limit or 10000} bars for {symbol}"
             )
 
+        have = df
         if self.use_parquet_cache:
-            df = await self._load_from_parquet(symbol, start, end)
-            if not df.empty:
-                logger.info(f"✅ Parquet: {len(df)} bars")
-                return df
-
-        df = await self._fetch_from_provider(symbol, start, end)
+            cached = await self._load_from_parquet(symbol, start, end)
+            if not cached.empty:
+                have = _combine(cached, have)  # DB rows win on overlap
+                if _enough(have, limit):
+                    logger.info(f"✅ Parquet: {len(cached)} bars (+{len(df)} from DB)")
+                    return have
+
+        # Fetch only what the DB and cache don't cover: the head/tail outside
+        # their span. If that still leaves the window short (holes inside the
+        # span), fall back to fetching the whole window.
+        fetched = await self._fetch_gaps(symbol, start, end, have)
+        df = _combine(have, fetched)
+        if not have.empty and len(df) < (limit or 0) * 0.8:
+            fetched = await self._fetch_window(symbol, start, end)
+            df = _combine(have, fetched)
 
         if df.empty:
             logger.warning(f"⚠️  No data available for {symbol}")
             return df
 
-        asyncio.create_task(self._save_to_database(symbol, df))
+        if not fetched.empty:
+            self._save_in_background(symbol, fetched)
 
-        if self.use_parquet_cache:
-            asyncio.create_task(self._save_to_parquet(symbol, df))
+        return df
+
+    async def load_many(
+        self,
+        symbols: list[str],
+        limit: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        days_lookback: Optional[int] = None,
+        purpose: str = "monitor"
+    ) -> dict[str, pd.DataFrame]:
+        """
+        `load_bars` for several symbols at once: {symbol: DataFrame}.
+
+        DB (and parquet) lookups run concurrently per symbol; the symbols
+        they can't satisfy are fetched in multi-symbol `historical_df_multi`
+        calls (see `_fetch_many_from_provider`) instead of one provider
+        round-trip each.
+        """
+        start, end = self._window(start, end, days_lookback)
+        logger.info(
+            f"Loading {len(symbols)} symbols [{purpose}]: {start.date()} to {end.date()} "
+            f"(target: {limit or 'all'} bars each)"
+        )
+
+        frames = await asyncio.gather(
+            *(self._load_from_database(s, limit or 10000, start, end) for s in symbols)
+        )
+        have = dict(zip(symbols, frames))
+        out = {s: df for s, df in have.items() if _enough(df, limit)}
+        short = [s for s in symbols if s not in out]
+
+        if short and self.use_parquet_cache:
+            cached = await asyncio.gather(*(self._load_from_parquet(s, start, end) for s in short))
+            for symbol, df in zip(short, cached):
+                have[symbol] = _combine(df, have[symbol])  # DB rows win on overlap
+                if _enough(have[symbol], limit):
+                    out[symbol] = have[symbol]
+            short = [s for s in short if s not in out]
+
+        if short:
+            fetched = await self._fetch_many_from_provider(short, start, end)
+            for symbol in short:
+                new = fetched.get(symbol, pd.DataFrame())
+                out[symbol] = _combine(have[symbol], new)
+                if new.empty:
+                    logger.warning(f"⚠️  No provider data for {symbol}")
+                    continue
+                self._save_in_background(symbol, new)
+
+        return {s: out[s] for s in symbols}
+
+    @staticmethod
+    def _window(
+        start: Optional[datetime],
+        end: Optional[datetime],
+        days_lookback: Optional[int]
+    ) -> tuple[datetime, datetime]:
+        if end is None:
+            end = datetime.now(timezone.utc)
+
+        if start is None:
+            if days_lookback:
+                start = end - timedelta(days=days_lookback)
+            else:
+                start = end - timedelta(days=30)
+        return start, end
 
+    async def _fetch_gaps(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        have: pd.DataFrame
+    ) -> pd.DataFrame:
+        """Provider bars for the parts of [start, end] outside `have`'s span."""
+        if have.empty:
+            windows = [(start, end)]
+        else:
+            step = timedelta(minutes=1)
+            windows = [
+                (a, b) for a, b in (
+                    (start, have.index[0].to_pydatetime() - step),
+                    (have.index[-1].to_pydatetime() + step, end),
+                )
+                if a <= b
+            ]
+        frames = await asyncio.gather(*(self._fetch_window(symbol, a, b) for a, b in windows))
+        return _combine(*frames)
+
+    async def _fetch_window(self, symbol: str, start: datetime, end: datetime) -> pd.DataFrame:
+        """`_fetch_from_provider`, skipping windows already known to be empty."""
+        span = self._known_empty.get(symbol)
+        if span and span[0] <= start and end <= span[1]:
+            return pd.DataFrame()
+        try:
+            df = await self._provider_bars(symbol, start, end)
+        except Exception:
+            return pd.DataFrame()  # no answer is not "no bars": don't remember it
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        if df.empty and end < today:
+            if span and start <= span[1] and span[0] <= end:
+                start, end = min(start, span[0]), max(end, span[1])
+            self._known_empty[symbol] = (start, end)
         return df
 
     async def _load_from_database(
@@ -140,13 +291,26 @@ class HistoricalDataLoader:
         start: datetime,
         end: datetime
     ) -> pd.DataFrame:
-        """Fetch data from provider with timeout."""
+        """Fetch data from provider with timeout; empty on failure."""
+        try:
+            return await self._provider_bars(symbol, start, end)
+        except Exception:
+            return pd.DataFrame()
+
+    async def _provider_bars(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        """Fetch data from provider with timeout. Failures are logged and
+        re-raised, so callers can tell "no bars" from "no answer"."""
         try:
             logger.info(f"🌐 Fetching {symbol} from API...")
 
             df = await asyncio.wait_for(
                 self.provider.historical_df(symbol, start, end, timeframe="1Min"),
-                timeout=30.0
+                timeout=_FETCH_TIMEOUT
             )
 
             if df.empty:
@@ -157,66 +321,169 @@ class HistoricalDataLoader:
             return df
 
         except asyncio.TimeoutError:
-            logger.error(f"❌ API timeout after 30s for {symbol}")
-            return pd.DataFrame()
+            logger.error(f"❌ API timeout after {_FETCH_TIMEOUT:.0f}s for {symbol}")
+            raise
         except Exception as e:
             logger.error(f"❌ API error for {symbol}: {e}")
-            return pd.DataFrame()
+            raise
+
+    async def _fetch_many_from_provider(
+        self,
+        symbols: list[str],
+        start: datetime,
+        end: datetime
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Fetch several symbols in multi-symbol provider calls of at most
+        `_MULTI_CHUNK` symbols, run concurrently. A chunk that times out or
+        fails loses only its own symbols.
+        """
+        chunks = [symbols[i:i + _MULTI_CHUNK] for i in range(0, len(symbols), _MULTI_CHUNK)]
+        out: dict[str, pd.DataFrame] = {}
+        for part in await asyncio.gather(*(self._fetch_chunk(c, start, end) for c in chunks)):
+            out.update(part)
+        return out
+
+    async def _fetch_chunk(
+        self,
+        symbols: list[str],
+        start: datetime,
+        end: datetime
+    ) -> dict[str, pd.DataFrame]:
+        """One `historical_df_multi` call; the timeout scales with the symbol
+        count since the provider pages through every symbol's bars."""
+        timeout = _FETCH_TIMEOUT * len(symbols)
+        try:
+            logger.info(f"🌐 Fetching {len(symbols)} symbols from API...")
+            return await asyncio.wait_for(
+                self.provider.historical_df_multi(symbols, start, end, timeframe="1Min"),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"❌ API timeout after {timeout:.0f}s for {symbols}")
+            return {}
+        except Exception as e:
+            logger.error(f"❌ API error for {symbols}: {e}")
+            return {}
+
+    def _save_in_background(self, symbol: str, df: pd.DataFrame) -> None:
+        """Write fetched bars to DB and parquet without delaying the caller."""
+        task = asyncio.create_task(self._save(symbol, df))
+        self._saves.add(task)
+        task.add_done_callback(self._saves.discard)
+
+    async def _save(self, symbol: str, df: pd.DataFrame):
+        # DB insert (network) and parquet write (disk) overlap.
+        if self.use_parquet_cache:
+            await asyncio.gather(
+                self._save_to_database(symbol, df), self._save_to_parquet(symbol, df)
+            )
+        else:
+            await self._save_to_database(symbol, df)
 
     async def _save_to_database(self, symbol: str, df: pd.DataFrame):
-        """Save bars to ClickHouse with batch inserts."""
+        """Save bars to ClickHouse in one column-oriented insert."""
         if df.empty:
             return
 
         try:
-            batch_size = 1000
-            total_records = len(df)
-            src = _source_tag()
-
-            logger.info(f"💾 Saving {total_records} bars to ClickHouse (batches of {batch_size})...")
-
-            for batch_num, start_idx in enumerate(range(0, total_records, batch_size), 1):
-                end_idx = min(start_idx + batch_size, total_records)
-                batch_df = df.iloc[start_idx:end_idx]
-
-                records = []
-                for ts, row in batch_df.iterrows():
-                    if ts.tzinfo is None:
-                        ts = ts.replace(tzinfo=timezone.utc)
-                    records.append({
-                        'symbol': symbol,
-                        'timestamp': ts,
-                        'open': float(row['open']),
-                        'high': float(row['high']),
-                        'low': float(row['low']),
-                        'close': float(row['close']),
-                        'volume': float(row['volume']),
-                        'vwap': float(row.get('vwap', 0) or 0),
-                        'trade_count': int(row.get('trade_count', 0) or 0),
-                        'source': src,
-                    })
-
-                await queries.insert_bars_batch_async(records)
-
-                logger.info(
-                    f"   💾 Batch {batch_num}/{(total_records + batch_size - 1) // batch_size}: "
-                    f"Saved {end_idx}/{total_records} bars"
-                )
-
-            logger.info(f"✅ Successfully saved all {total_records} bars")
+            logger.info(f"💾 Saving {len(df)} bars to ClickHouse...")
+            n = await queries.insert_bars_frame_async(symbol, df, source=_source_tag())
+            logger.info(f"✅ Successfully saved all {n} bars")
 
         except Exception as e:
             logger.error(f"❌ Failed to save to ClickHouse: {e}")
 
+    def _parquet_root(self, symbol: str) -> Path:
+        return self.parquet_dir / f"{symbol.upper()}_1m"
+
+    @staticmethod
+    def _parquet_month(root: Path, year: int, month: int) -> Path:
+        # One file per UTC month (hive-style dirs), so a save rewrites only
+        # the months it touches and a load reads only the months it asks for.
+        return root / f"year={year}" / f"month={month:02d}" / "bars.parquet"
+
+    @staticmethod
+    def _hot_month(root: Path, year: int, month: int) -> Path:
+        # The current month is rewritten on every save and read on every
+        # load, so it lives as an uncompressed Arrow IPC (Feather v2) file:
+        # no column encoding to write, memory-mapped to read. Closed months
+        # move to parquet on their next write.
+        return root / f"year={year}" / f"month={month:02d}" / "bars.arrow"
+
+    @staticmethod
+    def _is_hot(year: int, month: int) -> bool:
+        now = datetime.now(timezone.utc)
+        return (year, month) == (now.year, now.month)
+
     async def _load_from_parquet(
         self,
         symbol: str,
         start: datetime,
         end: datetime
     ) -> pd.DataFrame:
-        """Load from parquet cache (not implemented yet)."""
-        return pd.DataFrame()
+        """Load the cached [start, end] slice for `symbol` (empty on miss)."""
+        lo, hi = pd.Timestamp(start), pd.Timestamp(end)
+        root = self._parquet_root(symbol)
+        first = (lo.tz_convert("UTC") if lo.tz else lo).replace(day=1).normalize()
+        months = pd.date_range(first, hi, freq="MS")
+        paths = []
+        for m in months:
+            hot, cold = self._hot_month(root, m.year, m.month), self._parquet_month(root, m.year, m.month)
+            paths += [p for p in (hot, cold) if p.exists()][:1]
+        if not paths:
+            return pd.DataFrame()
+        try:
+            df = await asyncio.to_thread(
+                lambda: pd.concat([self._read_month(p, lo, hi) for p in paths])
+            )
+        except Exception as e:
+            logger.error(f"❌ Parquet read failed for {symbol}: {e}")
+            return pd.DataFrame()
+        # Month files are written sorted and concatenated in month order.
+        return df if df.index.is_monotonic_increasing else df.sort_index()
+
+    @staticmethod
+    def _read_month(path: Path, lo: pd.Timestamp, hi: pd.Timestamp) -> pd.DataFrame:
+        if path.suffix == ".arrow":
+            return feather.read_table(path, memory_map=True).to_pandas().loc[lo:hi]
+        # Push the time range into the reader: row groups whose timestamp
+        # stats fall outside [lo, hi] are skipped rather than read and masked.
+        return pd.read_parquet(path, filters=[("timestamp", ">=", lo), ("timestamp", "<=", hi)])
 
     async def _save_to_parquet(self, symbol: str, df: pd.DataFrame):
-        """Save to parquet cache (not implemented yet)."""
-        pass
+        """Merge `df` into the symbol's parquet cache (newer rows win)."""
+        if df.empty:
+            return
+        try:
+            await asyncio.to_thread(self._merge_parquet, symbol, df)
+        except Exception as e:
+            logger.error(f"❌ Failed to save {symbol} to parquet: {e}")
+
+    def _merge_parquet(self, symbol: str, df: pd.DataFrame) -> None:
+        root = self._parquet_root(symbol)
+        with _MERGE_LOCKS.setdefault(root.resolve(), threading.Lock()):
+            self._merge_months(root, df)
+
+    def _merge_months(self, root: Path, df: pd.DataFrame) -> None:
+        cols = [c for c in ("open", "high", "low", "close", "volume") if c in df.columns]
+        new = df[cols]
+        new = new.tz_localize("UTC") if new.index.tz is None else new.tz_convert("UTC")
+        new = new.rename_axis("timestamp")  # the column `_load_from_parquet` filters on
+        for (year, month), part in new.groupby([new.index.year, new.index.month]):
+            hot, cold = self._hot_month(root, year, month), self._parquet_month(root, year, month)
+            if hot.exists():
+                part = pd.concat([feather.read_table(hot).to_pandas(), part])
+            elif cold.exists():
+                part = pd.concat([pd.read_parquet(cold), part])
+            part = part[~part.index.duplicated(keep="last")]
+            if not part.index.is_monotonic_increasing:  # appends past the tail stay sorted
+                part = part.sort_index()
+            hot.parent.mkdir(parents=True, exist_ok=True)
+            if self._is_hot(year, month):
+                _write_atomic(hot, lambda p: part.to_feather(p, compression="uncompressed"))
+                cold.unlink(missing_ok=True)
+            else:
+                # ~1 week of 1m bars per row group, so range reads can prune.
+                _write_atomic(cold, lambda p: part.to_parquet(p, row_group_size=_PARQUET_ROW_GROUP))
+                hot.unlink(missing_ok=True)
@@ -442,16 +442,16 @@ class SchwabTipFill:
         if canonical.empty:
             return 0
         rows = []
-        for _, r in canonical.iterrows():
+        cols = canonical[["symbol", "timestamp", "open", "high", "low", "close", "volume"]]
+        for sym, ts, o, h, l, c, v in cols.itertuples(index=False, name=None):
             rows.append({
-                "symbol": r["symbol"],
-                "timestamp": r["timestamp"].to_pydatetime()
-                    if hasattr(r["timestamp"], "to_pydatetime") else r["timestamp"],
-                "open": float(r["open"]),
-                "high": float(r["high"]),
-                "low": float(r["low"]),
-                "close": float(r["close"]),
-                "volume": float(r["volume"]),
+                "symbol": sym,
+                "timestamp": ts.to_pydatetime() if hasattr(ts, "to_pydatetime") else ts,
+                "open": float(o),
+                "high": float(h),
+                "low": float(l),
+                "close": float(c),
+                "volume": float(v),
                 "vwap": 0.0,           # Schwab doesn't provide it
                 "trade_count": 0,      # Schwab doesn't provide it
                 "source": TIP_FILL_SOURCE_TAG,
@@ -44,9 +44,8 @@ class FakeLoader:
         end: datetime,
     ) -> pd.DataFrame:
         self.calls.append({"symbol": symbol, "start": start, "end": end})
-        # `_persist` walks `df.iterrows()` and reads OHLCV columns. Return a
-        # DataFrame with a DatetimeIndex so that `ts.tzinfo` works as expected
-        # in the real `_persist` (we patch around it in tests though).
+        # `_persist` reads the OHLCV columns and the DatetimeIndex. Return a
+        # frame shaped like a provider pull (we patch around it in tests though).
         idx = pd.date_range(start=start, periods=self.bars_per_call, freq="1min", tz=timezone.utc)
         return pd.DataFrame(
             {
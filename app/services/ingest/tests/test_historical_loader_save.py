@@ -0,0 +1,354 @@
+"""HistoricalDataLoader persists provider pulls as one column-oriented CH insert."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from app.db import queries
+from app.services.ingest.historical_loader import HistoricalDataLoader
+
+
+class _FakeClient:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, list, dict]] = []
+
+    def insert(self, table, data, **kwargs) -> None:
+        self.calls.append((table, data, kwargs))
+
+
+def _frame(n: int, tz: str | None = "UTC") -> pd.DataFrame:
+    idx = pd.date_range("2026-03-02 14:30", periods=n, freq="1min", tz=tz)
+    close = 100 + np.arange(n, dtype=float)
+    return pd.DataFrame(
+        {"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 10.0},
+        index=idx,
+    )
+
+
+def test_save_to_database_single_columnar_insert() -> None:
+    client = _FakeClient()
+    with patch("app.db.queries.get_client", return_value=client):
+        asyncio.run(HistoricalDataLoader(provider=None)._save_to_database("AAPL", _frame(2500)))
+
+    assert len(client.calls) == 1  # not one insert per 1k-row batch
+    table, cols, kw = client.calls[0]
+    assert table == "ohlcv_1m"
+    assert kw["column_oriented"] is True
+    assert kw["column_names"] == queries._INTRADAY_COLUMNS
+    assert all(len(c) == 2500 for c in cols)
+    by_name = dict(zip(kw["column_names"], cols))
+    assert by_name["symbol"][0] == "AAPL"
+    assert by_name["close"][-1] == 2599.0
+    assert not by_name["vwap"].any() and not by_name["trade_count"].any()
+
+
+def test_insert_bars_frame_localizes_naive_index() -> None:
+    client = _FakeClient()
+    with patch("app.db.queries.get_client", return_value=client):
+        assert queries.insert_bars_frame("MSFT", _frame(3, tz=None), source="alpaca") == 3
+        assert queries.insert_bars_frame("MSFT", _frame(0)) == 0
+
+    (_, cols, kw), = client.calls
+    by_name = dict(zip(kw["column_names"], cols))
+    assert str(by_name["timestamp"][0].tzinfo) == "UTC"
+    assert by_name["source"] == ["alpaca"] * 3
+
+
+def test_parquet_cache_merges_and_slices(tmp_path) -> None:
+    loader = HistoricalDataLoader(provider=None, parquet_dir=tmp_path, use_parquet_cache=True)
+    full = _frame(10)
+
+    async def _run():
+        await loader._save_to_parquet("AAPL", full.iloc[:6])
+        await loader._save_to_parquet("AAPL", full.iloc[4:].assign(close=-1.0))  # overlap: newer wins
+        return await loader._load_from_parquet("AAPL", full.index[2], full.index[7])
+
+    got = asyncio.run(_run())
+    assert list(got.index) == list(full.index[2:8])
+    assert list(got["close"]) == [102.0, 103.0, -1.0, -1.0, -1.0, -1.0]
+    assert asyncio.run(loader._load_from_parquet("MSFT", full.index[0], full.index[-1])).empty
+
+
+def test_parquet_cache_rewrites_only_touched_months(tmp_path) -> None:
+    loader = HistoricalDataLoader(provider=None, parquet_dir=tmp_path, use_parquet_cache=True)
+    idx = pd.date_range("2026-02-28 23:58", periods=4, freq="1min", tz="UTC")  # Feb -> Mar
+    df = pd.DataFrame({"open": 1.0, "high": 2.0, "low": 0.5, "close": [1.0, 2.0, 3.0, 4.0],
+                       "volume": 10.0}, index=idx)
+    root = tmp_path / "AAPL_1m"
+
+    async def _run():
+        await loader._save_to_parquet("AAPL", df)
+        feb = root / "year=2026" / "month=02" / "bars.parquet"
+        before = feb.stat().st_mtime_ns
+        await loader._save_to_parquet("AAPL", df.iloc[3:].assign(close=9.0))  # March only
+        assert feb.stat().st_mtime_ns == before
+        return await loader._load_from_parquet("AAPL", idx[1], idx[-1])
+
+    got = asyncio.run(_run())
+    assert sorted(p.parent.name for p in root.rglob("*.parquet")) == ["month=02", "month=03"]
+    assert list(got["close"]) == [2.0, 3.0, 9.0]
+
+
+def test_parquet_cache_range_read_uses_row_groups(tmp_path) -> None:
+    import pyarrow.parquet as pq
+
+    loader = HistoricalDataLoader(provider=None, parquet_dir=tmp_path, use_parquet_cache=True)
+    full = _frame(25_000)  # one month, three row groups
+    lo, hi = full.index[12_345], full.index[12_400]
+
+    async def _run():
+        await loader._save_to_parquet("AAPL", full)
+        return await loader._load_from_parquet("AAPL", lo, hi)
+
+    got = asyncio.run(_run())
+    pd.testing.assert_frame_equal(got, full.loc[lo:hi].rename_axis("timestamp"), check_freq=False)
+    meta = pq.ParquetFile(tmp_path / "AAPL_1m" / "year=2026" / "month=03" / "bars.parquet").metadata
+    assert meta.num_row_groups == 3
+
+
+def test_concurrent_saves_of_one_month_keep_every_bar(tmp_path) -> None:
+    loader = HistoricalDataLoader(provider=None, parquet_dir=tmp_path, use_parquet_cache=True)
+    full = _frame(4000)  # one month, saved as 8 disjoint slices at once
+
+    async def _run():
+        await asyncio.gather(*(loader._save_to_parquet("AAPL", full.iloc[i::8]) for i in range(8)))
+        return await loader._load_from_parquet("AAPL", full.index[0], full.index[-1])
+
+    got = asyncio.run(_run())
+    assert got["close"].tolist() == full["close"].tolist()
+    assert [p.name for p in (tmp_path / "AAPL_1m").rglob("*") if p.is_file()] == ["bars.parquet"]
+
+
+def test_fetch_bars_builds_frame_from_columns() -> None:
+    from clickhouse_connect.driver.query import QueryResult
+
+    full = _frame(3)
+    cols = [list(full.index.to_pydatetime())] + [full[c].tolist() for c in
+                                                  ("open", "high", "low", "close", "volume")]
+    seen = {}
+
+    class _Client:
+        def query(self, sql, **kw):
+            seen.update(kw)
+            return QueryResult(block_gen=iter([cols]), column_oriented=True,  # one native block
+                               column_names=("timestamp", "open", "high", "low", "close", "volume"))
+
+    with patch("app.db.queries.get_client", return_value=_Client()):
+        df = queries.fetch_bars("AAPL", full.index[0], full.index[-1], 10)
+
+    assert seen["column_oriented"] is True
+    assert df.index.name == "timestamp" and str(df.index.tz) == "UTC"
+    assert (df.index == full.index).all()
+    assert df["close"].tolist() == [100.0, 101.0, 102.0] and df["volume"].dtype == np.float64
+
+
+def test_fetch_bars_empty_result() -> None:
+    from clickhouse_connect.driver.query import QueryResult
+
+    class _Client:
+        def query(self, sql, **kw):
+            return QueryResult([])  # what the driver returns for zero rows
+
+    with patch("app.db.queries.get_client", return_value=_Client()):
+        df = queries.fetch_bars("AAPL", pd.Timestamp("2026-03-02", tz="UTC"),
+                                pd.Timestamp("2026-03-03", tz="UTC"), 10)
+
+    assert df.empty
+
+
+def test_load_bars_fetches_only_edge_gaps() -> None:
+    full = _frame(100)
+    calls = []
+
+    class _Provider:
+        async def historical_df(self, symbol, start, end, timeframe="1Min"):
+            calls.append((start, end))
+            return full.loc[start:end]
+
+    loader = HistoricalDataLoader(provider=_Provider(), use_parquet_cache=False)
+    have = full.iloc[30:60]
+
+    async def _db(symbol, limit, start, end):
+        return have
+
+    async def _run():
+        with patch.object(loader, "_load_from_database", _db), \
+             patch.object(loader, "_save_to_database", lambda *a: asyncio.sleep(0)):
+            return await loader.load_bars("AAPL", limit=100, start=full.index[0], end=full.index[-1])
+
+    got = asyncio.run(_run())
+    assert got.equals(full)
+    assert sorted(calls) == [(full.index[0], full.index[29]), (full.index[60], full.index[-1])]
+    # Past windows that came back empty are remembered, not re-requested —
+    # including the later, narrower head window once `start` has slid forward.
+    n = len(calls)
+    lo, hi = full.index[0] - pd.Timedelta(days=400), full.index[0] - pd.Timedelta(days=399)
+    assert asyncio.run(loader._fetch_window("AAPL", lo, hi)).empty
+    assert asyncio.run(loader._fetch_window("AAPL", lo + pd.Timedelta(hours=1), hi)).empty
+    assert asyncio.run(loader._fetch_window("MSFT", lo, hi)).empty  # per symbol
+    assert len(calls) == n + 2
+    assert list(loader._known_empty) == ["AAPL", "MSFT"]
+
+
+def test_failed_provider_window_is_not_remembered_as_empty() -> None:
+    calls = []
+
+    class _Provider:
+        async def historical_df(self, symbol, start, end, timeframe="1Min"):
+            calls.append(symbol)
+            if len(calls) == 1:
+                raise ConnectionError("reset by peer")
+            return pd.DataFrame()
+
+    loader = HistoricalDataLoader(provider=_Provider(), use_parquet_cache=False)
+    lo = pd.Timestamp("2025-01-06", tz="UTC")
+    hi = lo + pd.Timedelta(days=1)
+    for _ in range(3):
+        assert asyncio.run(loader._fetch_window("AAPL", lo, hi)).empty
+    assert len(calls) == 2  # retried after the failure; cached once truly empty
+    assert loader._known_empty == {"AAPL": (lo, hi)}
+    assert asyncio.run(loader._fetch_from_provider("AAPL", lo, hi)).empty  # still swallows
+
+
+def test_load_bars_partial_cache_merges_with_db_and_fetches_rest(tmp_path) -> None:
+    full = _frame(1000)
+    calls = []
+
+    class _Provider:
+        async def historical_df(self, symbol, start, end, timeframe="1Min"):
+            calls.append((start, end))
+            return full.loc[start:end]
+
+    loader = HistoricalDataLoader(provider=_Provider(), parquet_dir=tmp_path, use_parquet_cache=True)
+
+    async def _db(symbol, limit, start, end):
+        return full.iloc[:600]
+
+    async def _run():
+        await loader._save_to_parquet("AAPL", full.iloc[600:610])
+        with patch.object(loader, "_load_from_database", _db), \
+             patch.object(loader, "_save_to_database", lambda *a: asyncio.sleep(0)):
+            return await loader.load_bars("AAPL", limit=1000, start=full.index[0], end=full.index[-1])
+
+    got = asyncio.run(_run())
+    assert got.index.equals(full.index) and got["close"].tolist() == full["close"].tolist()
+    assert calls == [(full.index[610], full.index[-1])]  # only the uncovered tail
+
+
+def test_load_many_one_provider_call_for_short_symbols() -> None:
+    full = _frame(50)
+    calls = []
+
+    class _Provider:
+        async def historical_df_multi(self, symbols, start, end, timeframe="1Min"):
+            calls.append(list(symbols))
+            return {s: full for s in symbols if s != "TSLA"}
+
+    loader = HistoricalDataLoader(provider=_Provider(), use_parquet_cache=False)
+    db = {"AAPL": full, "MSFT": full.iloc[:5], "TSLA": pd.DataFrame(), "NVDA": pd.DataFrame()}
+
+    async def _db(symbol, limit, start, end):
+        return db[symbol]
+
+    async def _run():
+        with patch.object(loader, "_load_from_database", _db), \
+             patch.object(loader, "_save_to_database", lambda *a: asyncio.sleep(0)):
+            return await loader.load_many(list(db), limit=50, start=full.index[0], end=full.index[-1])
+
+    got = asyncio.run(_run())
+    assert calls == [["MSFT", "TSLA", "NVDA"]]
+    assert list(got) == ["AAPL", "MSFT", "TSLA", "NVDA"]
+    assert got["AAPL"] is full and got["MSFT"].equals(full) and got["NVDA"].equals(full)
+    assert got["TSLA"].empty
+
+
+def test_load_many_partial_cache_still_fetched(tmp_path) -> None:
+    full = _frame(100)
+    calls = []
+
+    class _Provider:
+        async def historical_df_multi(self, symbols, start, end, timeframe="1Min"):
+            calls.append(list(symbols))
+            return {s: full for s in symbols}
+
+    loader = HistoricalDataLoader(provider=_Provider(), parquet_dir=tmp_path, use_parquet_cache=True)
+    db = {"AAPL": full.iloc[:60], "MSFT": full.iloc[:60]}
+
+    async def _db(symbol, limit, start, end):
+        return db[symbol]
+
+    async def _run():
+        await loader._save_to_parquet("AAPL", full.iloc[60:70])  # DB + cache: 70% short
+        await loader._save_to_parquet("MSFT", full.iloc[60:])  # DB + cache: complete
+        with patch.object(loader, "_load_from_database", _db), \
+             patch.object(loader, "_save_to_database", lambda *a: asyncio.sleep(0)):
+            return await loader.load_many(list(db), limit=100, start=full.index[0], end=full.index[-1])
+
+    got = asyncio.run(_run())
+    assert calls == [["AAPL"]]
+    assert all(got[s].index.equals(full.index) for s in db)
+
+
+def test_fetch_many_chunks_with_per_chunk_timeout(monkeypatch) -> None:
+    from app.services.ingest import historical_loader as hl
+
+    full = _frame(5)
+    calls = []
+
+    class _Provider:
+        async def historical_df_multi(self, symbols, start, end, timeframe="1Min"):
+            calls.append(list(symbols))
+            if "S10" in symbols:
+                await asyncio.sleep(1)  # this chunk overruns its budget
+            return {s: full for s in symbols}
+
+    monkeypatch.setattr(hl, "_FETCH_TIMEOUT", 0.01)
+    loader = HistoricalDataLoader(provider=_Provider(), use_parquet_cache=False)
+    symbols = [f"S{i:02d}" for i in range(25)]
+    got = asyncio.run(loader._fetch_many_from_provider(symbols, full.index[0], full.index[-1]))
+
+    assert [len(c) for c in calls] == [10, 10, 5]
+    assert sorted(got) == symbols[:10] + symbols[20:]
+
+
+def test_background_save_overlaps_db_and_parquet(tmp_path) -> None:
+    loader = HistoricalDataLoader(provider=None, parquet_dir=tmp_path, use_parquet_cache=True)
+    events = []
+
+    async def _slow(name):
+        events.append(f"{name}:start")
+        await asyncio.sleep(0.01)
+        events.append(f"{name}:end")
+
+    async def _run():
+        with patch.object(loader, "_save_to_database", lambda *a: _slow("db")), \
+             patch.object(loader, "_save_to_parquet", lambda *a: _slow("pq")):
+            loader._save_in_background("AAPL", _frame(3))
+            assert len(loader._saves) == 1
+            await asyncio.gather(*loader._saves)
+
+    asyncio.run(_run())
+    assert events[:2] == ["db:start", "pq:start"]
+    assert not loader._saves
+
+
+def test_current_month_cached_as_arrow_then_archived(tmp_path) -> None:
+    loader = HistoricalDataLoader(provider=None, parquet_dir=tmp_path, use_parquet_cache=True)
+    full = _frame(10)  # 2026-03
+    month = tmp_path / "AAPL_1m" / "year=2026" / "month=03"
+
+    async def _run():
+        with patch.object(HistoricalDataLoader, "_is_hot", staticmethod(lambda y, m: True)):
+            await loader._save_to_parquet("AAPL", full.iloc[:6])
+            assert [p.name for p in month.iterdir()] == ["bars.arrow"]
+            hot = await loader._load_from_parquet("AAPL", full.index[2], full.index[4])
+        await loader._save_to_parquet("AAPL", full.iloc[6:])  # month closed: goes to parquet
+        return hot, await loader._load_from_parquet("AAPL", full.index[0], full.index[-1])
+
+    hot, cold = asyncio.run(_run())
+    assert [p.name for p in month.iterdir()] == ["bars.parquet"]
+    assert hot["close"].tolist() == [102.0, 103.0, 104.0]
+    assert cold["close"].tolist() == full["close"].tolist()
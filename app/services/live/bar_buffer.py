@@ -0,0 +1,129 @@
+"""Columnar rolling bar buffer for the live monitor.
+
+MonitorService used to keep each symbol's bars as a list of dicts and
+rebuild a DataFrame from all ~2-3k of them on every incoming minute bar.
+`BarBuffer` keeps the same window as preallocated NumPy columns instead:
+appending a bar is a handful of scalar writes, and the detector input is
+a Series wrapped around a view of the filled prefix — no per-bar dict
+materialisation, no DataFrame construction.
+
+Design choices:
+- float64, not float32. The indicators are EWM-seeded from the first
+  bar of the window, so reduced precision would shift values and could
+  flip the strict pivot / divergence comparisons.
+- Trim on overflow by copying the newest `keep` rows into fresh arrays
+  (once every `max_bars - keep` bars) rather than shifting in place, so
+  a Series handed out earlier never sees its data move underneath it.
+- `extra` columns (e.g. a streamed indicator value per bar) live in the
+  same arrays, so they trim with the bars and stay aligned to them.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class BarBuffer:
+    """Last `max_bars` OHLCV bars for one symbol, trimmed to `keep` on overflow."""
+
+    def __init__(self, max_bars: int = 3000, keep: int = 2200,
+                 extra: tuple[str, ...] = ()) -> None:
+        if not 0 < keep <= max_bars:
+            raise ValueError(f"need 0 < keep <= max_bars, got keep={keep}, max_bars={max_bars}")
+        self.max_bars = max_bars
+        self.keep = keep
+        self.fields = FIELDS + tuple(extra)
+        self._n = 0
+        self._alloc(max_bars + 1)
+
+    def _alloc(self, capacity: int) -> None:
+        self._ts = np.empty(capacity, dtype=np.int64)  # UTC epoch ns
+        self._cols = {f: np.empty(capacity, dtype=np.float64) for f in self.fields}
+
+    def __len__(self) -> int:
+        return self._n
+
+    def append(self, ts: datetime, open: float, high: float, low: float,
+               close: float, volume: float, **extra: float) -> None:
+        """
+        Add one bar (`ts` tz-aware); trims to `keep` once past `max_bars`.
+        Extra columns not passed are NaN.
+        """
+        i = self._n
+        self._ts[i] = pd.Timestamp(ts).as_unit("ns").value
+        for f, v in zip(FIELDS, (open, high, low, close, volume)):
+            self._cols[f][i] = v
+        for f in self.fields[len(FIELDS):]:
+            self._cols[f][i] = extra.get(f, np.nan)
+        self._n = i + 1
+        if self._n > self.max_bars:
+            self._trim(self.keep)
+
+    def extend(self, df: pd.DataFrame) -> None:
+        """
+        Bulk-append a bars frame (DatetimeIndex + OHLCV columns, plus any
+        extra columns), oldest first. Missing OHLCV columns are 0, missing
+        extra columns NaN.
+        """
+        if df.empty:
+            return
+        idx = df.index if df.index.tz is not None else df.index.tz_localize("UTC")
+        ts = idx.as_unit("ns").asi8
+        cols = {
+            f: (df[f].to_numpy(dtype=np.float64) if f in df.columns
+                else np.full(len(df), 0.0 if f in FIELDS else np.nan))
+            for f in self.fields
+        }
+        if self._n + len(df) > self.max_bars:
+            # Keep the newest max_bars across what is buffered plus the frame.
+            merged_ts = np.concatenate([self._ts[:self._n], ts])[-self.max_bars:]
+            merged = {
+                f: np.concatenate([self._cols[f][:self._n], cols[f]])[-self.max_bars:]
+                for f in self.fields
+            }
+            self._alloc(self.max_bars + 1)
+            self._n = len(merged_ts)
+            self._ts[:self._n] = merged_ts
+            for f in self.fields:
+                self._cols[f][:self._n] = merged[f]
+            return
+        j = self._n + len(df)
+        self._ts[self._n:j] = ts
+        for f in self.fields:
+            self._cols[f][self._n:j] = cols[f]
+        self._n = j
+
+    def _trim(self, keep: int) -> None:
+        ts, cols, n = self._ts, self._cols, self._n
+        self._alloc(self.max_bars + 1)
+        self._ts[:keep] = ts[n - keep:n]
+        for f in self.fields:
+            self._cols[f][:keep] = cols[f][n - keep:n]
+        self._n = keep
+
+    def last_ns(self) -> int | None:
+        """Epoch-ns timestamp of the newest bar (None when empty)."""
+        return int(self._ts[self._n - 1]) if self._n else None
+
+    def index(self, last: int | None = None) -> pd.DatetimeIndex:
+        """UTC DatetimeIndex of the buffered bars (only the newest `last`, if given)."""
+        lo = 0 if last is None else max(self._n - last, 0)
+        return pd.DatetimeIndex(self._ts[lo:self._n].view("datetime64[ns]"), tz="UTC")
+
+    def series(self, field: str, index: pd.DatetimeIndex | None = None) -> pd.Series:
+        """
+        `field` as a Series over a view of the buffer. Pass `index` (from
+        `index()`) to share one; the Series then covers the same newest bars.
+        """
+        if index is None:
+            index = self.index()
+        return pd.Series(
+            self._cols[field][self._n - len(index):self._n],
+            index=index,
+            name=field,
+            copy=False,
+        )
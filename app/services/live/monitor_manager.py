@@ -6,6 +6,7 @@ Handles starting, stopping, and tracking multiple divergence monitors
 """
 import asyncio
 import logging
+from collections import OrderedDict
 from typing import Callable, Dict, Optional
 
 from app.config import get_provider
@@ -13,6 +14,33 @@ from app.services.live.monitor_service import MonitorService
 
 logger = logging.getLogger(__name__)
 
+# How many monitors that ended on their own (failed/completed) stay
+# visible in `list_monitors` after being reaped.
+_FINISHED_KEEP = 50
+
+
+async def _cancel_and_wait(task: asyncio.Task) -> None:
+    """Cancel `task` and wait until it has unwound (its finally blocks ran).
+
+    gather(return_exceptions=True) absorbs the task's own CancelledError or
+    failure, but still propagates a cancellation of the caller.
+    """
+    if task.done():
+        return
+    task.cancel()
+    (result,) = await asyncio.gather(task, return_exceptions=True)
+    if isinstance(result, Exception):
+        logger.error(f"Error stopping task: {result}")
+
+
+def _task_status(task: asyncio.Task) -> str:
+    if not task.done():
+        return "running"
+    if task.cancelled():
+        return "cancelled"
+    exception = task.exception()
+    return f"failed: {exception}" if exception else "completed"
+
 
 async def _run_wave_scanner(scanner, symbols: list, provider) -> None:
     """Long-running task: subscribe the scanner to live bars then heartbeat.
@@ -41,15 +69,42 @@ class MonitorManager:
     
     def __init__(self):
         self.monitors: Dict[str, Dict] = {}  # Changed to store more info
+        # Status of monitors whose task ended on its own, newest last and
+        # bounded. Their `monitors` entry (task, callbacks, provider refs)
+        # is dropped as soon as the task finishes.
+        self.finished: "OrderedDict[str, Dict]" = OrderedDict()
         self.provider = None
+
+    def _track(self, key: str, info: Dict) -> None:
+        """Register a monitor entry and reap it when its task ends."""
+        self.monitors[key] = info
+        self.finished.pop(key, None)
+        info['task'].add_done_callback(lambda task, key=key: self._reap(key, task))
+
+    def _reap(self, key: str, task: asyncio.Task) -> None:
+        info = self.monitors.get(key)
+        if info is None or info['task'] is not task:
+            return  # already stopped, or replaced by a newer monitor
+        del self.monitors[key]
+        status = _task_status(task)
+        if status == "cancelled":
+            return
+        if status.startswith("failed"):
+            logger.error(f"Monitor {key} {status}")
+        else:
+            logger.info(f"Monitor {key} completed")
+        self.finished[key] = {k: v for k, v in info.items() if k != 'task'} | {'status': status}
+        while len(self.finished) > _FINISHED_KEEP:
+            self.finished.popitem(last=False)
     
     def _get_key(self, tickers: list[str], indicator: str, signal_type: str) -> str:
-        """Generate unique key for a monitor configuration."""
-        return f"{','.join(sorted(tickers))}:{indicator}:{signal_type}"
+        """Generate unique key for a monitor configuration (ticker order/repeats ignored)."""
+        return f"{','.join(sorted(set(tickers)))}:{indicator}:{signal_type}"
     
     def list_monitors(self) -> dict:
         """
-        List all active monitors and their status.
+        List all active monitors and their status, plus the most recent
+        ones that ended on their own (failed/completed).
         
         FIXED: Removed task.done() check which was causing hangs.
         Now uses exception handling to detect cancelled tasks.
@@ -57,7 +112,7 @@ class MonitorManager:
         Returns:
             Dict mapping monitor keys to status info
         """
-        result = {}
+        result = {key: dict(info) for key, info in self.finished.items()}
         
         for key, monitor_info in list(self.monitors.items()):
             task = monitor_info['task']
@@ -147,12 +202,12 @@ class MonitorManager:
         task = asyncio.create_task(monitor_service.monitor(tickers))
         
         # Store monitor info
-        self.monitors[key] = {
+        self._track(key, {
             'task': task,
             'tickers': tickers,
             'indicator': indicator,
             'signal_type': signal_type,
-        }
+        })
         
         logger.info(f"✅ Started monitor: {key}")
         return {
@@ -163,7 +218,7 @@ class MonitorManager:
             "signal_type": signal_type
         }
     
-    def stop_monitor(
+    async def stop_monitor(
         self,
         tickers: list[str],
         indicator: str,
@@ -189,12 +244,13 @@ class MonitorManager:
                 "key": key
             }
         
-        monitor_info = self.monitors[key]
+        # Untrack first so the done-callback (_reap) sees it already stopped
+        monitor_info = self.monitors.pop(key)
         task = monitor_info['task']
         
-        # Cancel if still running
+        # Cancel if still running, and let it unwind before unsubscribing
         if not task.done():
-            task.cancel()
+            await _cancel_and_wait(task)
             logger.info(f"Cancelled monitor task: {key}")
         
         # Unsubscribe from provider
@@ -204,9 +260,6 @@ class MonitorManager:
             except Exception as e:
                 logger.error(f"Error unsubscribing: {e}")
         
-        # Remove from tracking
-        del self.monitors[key]
-        
         logger.info(f"🛑 Stopped monitor: {key}")
         return {
             "status": "stopped",
@@ -217,7 +270,7 @@ class MonitorManager:
     # ── Elliott Wave live scanner (EW-7 live path) ──────────────────────────
 
     def _wave_key(self, symbols: list[str], interval: str) -> str:
-        return f"wave:{interval}:{','.join(sorted(symbols))}"
+        return f"wave:{interval}:{','.join(sorted(set(symbols)))}"
 
     def start_wave_scanner(
         self,
@@ -255,25 +308,23 @@ class MonitorManager:
             min_risk_reward=min_risk_reward,
         )
         task = asyncio.create_task(_run_wave_scanner(scanner, symbols, self.provider))
-        self.monitors[key] = {
+        self._track(key, {
             "task": task,
             "tickers": symbols,
             "indicator": "elliott_wave",
             "signal_type": f"wave_{interval}",
-        }
+        })
         logger.info("✅ Started wave scanner: %s (%d symbols)", key, len(symbols))
         return {"status": "started", "key": key, "symbols": symbols, "interval": interval}
 
-    def stop_wave_scanner(self, symbols: list[str], interval: str = "5m") -> dict:
+    async def stop_wave_scanner(self, symbols: list[str], interval: str = "5m") -> dict:
         """Stop a running wave scanner."""
         key = self._wave_key(symbols, interval)
         if key not in self.monitors:
             return {"status": "not_found", "key": key}
 
         info = self.monitors.pop(key)
-        task = info["task"]
-        if not task.done():
-            task.cancel()
+        await _cancel_and_wait(info["task"])
 
         if self.provider:
             try:
@@ -304,17 +355,10 @@ class MonitorManager:
         """
         logger.info("Stopping all monitors...")
         
-        # Cancel all tasks
-        for key, monitor_info in list(self.monitors.items()):
-            task = monitor_info['task']
-            if not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    logger.debug(f"Task cancelled: {key}")
-                except Exception as e:
-                    logger.error(f"Error stopping task {key}: {e}")
+        # Cancel all tasks and wait for them to unwind together
+        await asyncio.gather(
+            *(_cancel_and_wait(info['task']) for info in list(self.monitors.values()))
+        )
         
         # Stop data provider
         if self.provider:
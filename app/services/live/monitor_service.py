@@ -6,10 +6,14 @@ in real-time using a sliding window approach.
 """
 import asyncio
 import logging
-import pandas as pd
+import time
+from functools import partial
 from datetime import timezone, datetime
 from typing import Optional, Callable
 
+import numpy as np
+import pandas as pd
+
 from app.db import get_bar_batcher
 from app.db import queries
 from app.config import settings
@@ -24,6 +28,7 @@ from app.signals.divergence import (
 )
 from app.providers.base import DataProvider
 from app.services.ingest.historical_loader import HistoricalDataLoader
+from app.services.live.bar_buffer import BarBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -64,8 +69,22 @@ class MonitorService:
         self.indicator_name = indicator_name
         self.signal_type = signal_type
         self.broadcast_cb = broadcast_cb
-        self.buffers = {}
+        self.buffers: dict[str, BarBuffer] = {}
         self.last_bar_time = {}  # Track last bar timestamp per symbol
+        # time.monotonic() of the last bar received (or monitor start) per
+        # symbol; the heartbeat's idle check, immune to wall-clock steps.
+        self._last_bar_mono: dict[str, float] = {}
+        # Last emitted (p1_ts, p2_ts) per symbol. A divergence stays
+        # detectable on every bar until a newer pivot replaces it; without
+        # this each of those bars would re-insert and re-broadcast it.
+        self.last_signal = {}
+        # Streaming indicator state per symbol (for indicators with
+        # `streams`): each bar advances it in O(1) and the value is stored
+        # alongside the bar, instead of recomputing over the whole buffer.
+        # Values are as of each bar's arrival, over the full history since
+        # preload — a recompute would backfill a warmup prefix and, after
+        # a trim, re-seed from the window's first bar.
+        self.ind_state = {}
         
         # Initialize historical data loader
         self.historical_loader = HistoricalDataLoader(provider)
@@ -75,10 +94,15 @@ class MonitorService:
             raise ValueError(f"Unknown indicator: {indicator_name}")
         self.indicator = INDICATOR_MAP[indicator_name]()
         
-        # Get detector function
+        # Get detector function, with the window settings bound once; they
+        # are fixed for the life of the process.
         if signal_type not in DETECTOR_MAP:
             raise ValueError(f"Unknown signal type: {signal_type}")
-        self.detector = DETECTOR_MAP[signal_type]
+        self.detector = partial(
+            DETECTOR_MAP[signal_type],
+            lookback=settings.lookback_bars,
+            k=settings.pivot_k,
+        )
         
         logger.info(f"MonitorService initialized: {indicator_name} / {signal_type}")
     
@@ -101,34 +125,27 @@ class MonitorService:
             f"{settings.monitor_preload_days} days lookback"
         )
         
-        # Preload historical data for each symbol
+        # Preload historical data for all symbols at once
+        # HistoricalDataLoader automatically handles:
+        # - Database cache check
+        # - API fallback if insufficient data (one request for all symbols)
+        # - Saving fetched data to database
+        preloaded = await self.historical_loader.load_many(
+            tickers,
+            purpose="monitor"  # Uses monitor-specific config defaults
+        )
         for symbol in tickers:
-            self.buffers[symbol] = []
+            self.buffers[symbol] = self._new_buffer()
             self.last_bar_time[symbol] = datetime.now(timezone.utc)
-            
-            # Use HistoricalDataLoader with config-driven settings
-            # This automatically handles:
-            # - Database cache check
-            # - API fallback if insufficient data
-            # - Saving fetched data to database
-            df = await self.historical_loader.load_bars(
-                symbol,
-                purpose="monitor"  # Uses monitor-specific config defaults
-            )
+            self._last_bar_mono[symbol] = time.monotonic()
+            df = preloaded[symbol]
             
             if not df.empty:
-                # Convert DataFrame to buffer format
-                for ts, row in df.iterrows():
-                    bar_dict = {
-                        'timestamp': ts,
-                        'open': float(row['open']),
-                        'high': float(row['high']),
-                        'low': float(row['low']),
-                        'close': float(row['close']),
-                        'volume': int(row.get('volume', 0) or 0),
-                    }
-                    self.buffers[symbol].append(bar_dict)
-                
+                if self.indicator.streams:
+                    close = df["close"].to_numpy(dtype=np.float64)
+                    self.ind_state[symbol] = self.indicator.new_state(close)
+                    df = df.assign(indicator=self.indicator.compute_array(close))
+                self.buffers[symbol].extend(df)
                 self.last_bar_time[symbol] = df.index[-1]
             
             # Log buffer status with detailed info
@@ -176,6 +193,10 @@ class MonitorService:
             logger.info("🛑 Monitor cancelled")
             raise
     
+    def _new_buffer(self) -> BarBuffer:
+        """Rolling bar buffer, with an `indicator` column when it streams."""
+        return BarBuffer(extra=("indicator",) if self.indicator.streams else ())
+
     def _log_heartbeat(self, tickers: list[str]):
         """
         Log periodic heartbeat with monitor status.
@@ -183,15 +204,15 @@ class MonitorService:
         Args:
             tickers: List of monitored symbols
         """
-        now = datetime.now(timezone.utc)
+        now = time.monotonic()
         status_lines = [f"💓 Monitor heartbeat: {len(tickers)} symbols"]
         
         for symbol in tickers:
             buffer_size = len(self.buffers.get(symbol, []))
-            last_bar = self.last_bar_time.get(symbol)
+            last_bar = self._last_bar_mono.get(symbol)
             
-            if last_bar:
-                idle_seconds = (now - last_bar).total_seconds()
+            if last_bar is not None:
+                idle_seconds = now - last_bar
                 idle_status = "🟢 active" if idle_seconds < 300 else "🟡 idle"
                 status_lines.append(
                     f"  {symbol}: {buffer_size} bars, "
@@ -223,62 +244,84 @@ class MonitorService:
         if ts.tzinfo is None:
             ts = ts.replace(tzinfo=timezone.utc)
         
-        logger.info(f"📊 {symbol}: ${bar.close:.2f} @ {ts}")
-        
-        # Update last bar time for heartbeat monitoring
-        self.last_bar_time[symbol] = ts
+        # Per-bar log lines use lazy %-args: nothing is formatted when the
+        # level is disabled.
+        logger.info("📊 %s: $%.2f @ %s", symbol, bar.close, ts)
         
         # Save to database (async task, don't block processing)
         asyncio.create_task(self._persist_bar(symbol, ts, bar))
         
-        # Add to rolling buffer
-        bar_dict = {
-            'timestamp': ts,
-            'open': float(bar.open),
-            'high': float(bar.high),
-            'low': float(bar.low),
-            'close': float(bar.close),
-            'volume': int(getattr(bar, 'volume', 0) or 0),
-        }
+        # Redelivered or out-of-order bars (common on stream reconnects) are
+        # persisted above — the bar table dedups on (symbol, timestamp) —
+        # but must not advance the indicator state or re-run detection.
+        buf = self.buffers[symbol]
+        last = buf.last_ns()
+        if last is not None and pd.Timestamp(ts).value <= last:
+            logger.debug("↩️  %s: skipping stale bar @ %s", symbol, ts)
+            return
         
-        self.buffers[symbol].append(bar_dict)
+        # Update last bar time for heartbeat monitoring
+        self.last_bar_time[symbol] = ts
+        self._last_bar_mono[symbol] = time.monotonic()
         
-        # Trim buffer to prevent memory bloat (keep ~2200 bars)
-        if len(self.buffers[symbol]) > 3000:
-            self.buffers[symbol] = self.buffers[symbol][-2200:]
-            logger.debug(f"🔄 {symbol}: Buffer trimmed to 2200 bars")
+        # Advance the streaming indicator by this bar (seeded from what is
+        # already buffered the first time a symbol is seen)
+        extra = {}
+        if self.indicator.streams:
+            state = self.ind_state.get(symbol)
+            if state is None:
+                state = self.ind_state[symbol] = self.indicator.new_state(
+                    buf.series('close').to_numpy()
+                )
+            extra['indicator'] = self.indicator.update(state, float(bar.close))
+        
+        # Add to rolling buffer (trims itself to 2200 bars past 3000)
+        buf.append(
+            ts,
+            float(bar.open),
+            float(bar.high),
+            float(bar.low),
+            float(bar.close),
+            float(getattr(bar, 'volume', 0) or 0),
+            **extra,
+        )
         
         # Check if we have enough data for analysis
-        buffer_size = len(self.buffers[symbol])
+        buffer_size = len(buf)
         required_bars = settings.lookback_bars
         
         if buffer_size < required_bars:
             logger.info(
-                f"⏳ {symbol}: Collecting data ({buffer_size}/{required_bars})"
+                "⏳ %s: Collecting data (%d/%d)", symbol, buffer_size, required_bars
             )
             return
         
-        # Convert buffer to DataFrame for analysis
-        df = pd.DataFrame(self.buffers[symbol])
-        df.set_index('timestamp', inplace=True)
+        # Series views over the buffer (no per-bar DataFrame rebuild). A
+        # streamed indicator is already stored per bar, so only the
+        # detector's lookback window is needed; otherwise the indicator is
+        # recomputed over the whole buffer.
+        index = buf.index(required_bars if self.indicator.streams else None)
+        close = buf.series('close', index)
         
-        # Calculate indicator values
-        ind_values = self.indicator.compute(
-            df['close'],
-            df.get('high'),
-            df.get('low')
-        )
+        # Indicator values: streamed per bar, or recomputed over the window
+        if self.indicator.streams:
+            ind_values = buf.series('indicator', index)
+        elif self.indicator.uses_high_low:
+            ind_values = self.indicator.compute(
+                close, buf.series('high', index), buf.series('low', index)
+            )
+        else:
+            ind_values = self.indicator.compute(close)
         
         # Detect divergence using configured parameters
-        result = self.detector(
-            df['close'],
-            ind_values,
-            lookback=settings.lookback_bars,
-            k=settings.pivot_k
-        )
+        result = self.detector(close, ind_values)
         
-        # Handle signal detection
+        # Handle signal detection (once per pivot pair)
         if result:
+            key = (result['p1_ts'], result['p2_ts'])
+            if self.last_signal.get(symbol) == key:
+                return
+            self.last_signal[symbol] = key
             logger.warning(f"🚨 SIGNAL DETECTED: {symbol} - {self.signal_type}")
             logger.warning(f"   Price: ${result['price']:.2f}")
             logger.warning(f"   {self.indicator_name.upper()}: {result['indicator_value']:.2f}")
@@ -321,9 +364,9 @@ class MonitorService:
                 "trade_count": int(getattr(bar, "trade_count", 0) or 0),
                 "source": src,
             })
-            logger.debug(f"💾 Queued bar: {symbol} @ {ts}")
+            logger.debug("💾 Queued bar: %s @ %s", symbol, ts)
         except Exception as e:
-            logger.error(f"Error queueing bar: {e}")
+            logger.error("Error queueing bar: %s", e)
 
     async def _persist_signal(self, symbol: str, result: dict):
         """
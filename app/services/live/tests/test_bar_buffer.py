@@ -0,0 +1,76 @@
+"""BarBuffer keeps the monitor's rolling window as NumPy columns."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.live.bar_buffer import BarBuffer
+
+T0 = datetime(2026, 3, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def _append(buf: BarBuffer, i: int) -> None:
+    buf.append(T0 + timedelta(minutes=i), 1.0, 2.0, 0.5, float(i), 10.0)
+
+
+def test_append_trims_like_the_old_list_buffer() -> None:
+    buf = BarBuffer(max_bars=5, keep=3)
+    ref: list[int] = []
+    for i in range(12):
+        _append(buf, i)
+        ref.append(i)
+        if len(ref) > 5:
+            ref = ref[-3:]
+        assert len(buf) == len(ref)
+        assert buf.series("close").tolist() == [float(x) for x in ref]
+    idx = buf.index()
+    assert str(idx.tz) == "UTC" and idx[-1] == pd.Timestamp(T0 + timedelta(minutes=11))
+
+
+def test_series_survive_a_trim() -> None:
+    buf = BarBuffer(max_bars=4, keep=2)
+    for i in range(4):
+        _append(buf, i)
+    before = buf.series("close")
+    _append(buf, 4)  # trims
+    assert before.tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert buf.series("close").tolist() == [3.0, 4.0]
+
+
+def test_extend_frame_keeps_newest_max_bars() -> None:
+    idx = pd.date_range("2026-03-02 14:30", periods=8, freq="1min")  # naive -> UTC
+    df = pd.DataFrame({"open": 1.0, "high": 2.0, "low": 0.5, "close": np.arange(8.0)}, index=idx)
+    buf = BarBuffer(max_bars=5, keep=3)
+    buf.extend(df.iloc[:2])
+    buf.extend(df.iloc[2:])
+    assert buf.series("close").tolist() == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert (buf.series("volume") == 0).all()
+    assert buf.index()[0] == idx[3].tz_localize("UTC")
+
+
+def test_rejects_bad_sizes() -> None:
+    with pytest.raises(ValueError):
+        BarBuffer(max_bars=3, keep=4)
+
+
+def test_extra_columns_trim_with_the_bars() -> None:
+    buf = BarBuffer(max_bars=4, keep=2, extra=("indicator",))
+    for i in range(5):
+        buf.append(T0 + timedelta(minutes=i), 1.0, 2.0, 0.5, float(i), 10.0, indicator=i * 10.0)
+    assert buf.series("indicator").tolist() == [30.0, 40.0]
+    _append(buf, 5)  # not passed -> NaN
+    assert np.isnan(buf.series("indicator").iloc[-1])
+
+
+def test_tail_index_and_series() -> None:
+    buf = BarBuffer(max_bars=10, keep=5)
+    for i in range(6):
+        _append(buf, i)
+    idx = buf.index(3)
+    assert list(idx) == list(buf.index()[-3:])
+    assert buf.series("close", idx).tolist() == [3.0, 4.0, 5.0]
+    assert len(buf.index(50)) == 6
+    assert buf.last_ns() == idx[-1].value
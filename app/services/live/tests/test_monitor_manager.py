@@ -0,0 +1,68 @@
+"""MonitorManager drops monitors whose task ends on its own, keeping their status."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.live import monitor_manager as mm
+from app.services.live.monitor_manager import MonitorManager
+
+
+async def _fail():
+    raise RuntimeError("feed lost")
+
+
+@pytest.mark.asyncio
+async def test_finished_monitor_is_reaped(monkeypatch):
+    mgr = MonitorManager()
+    mgr._track("AAPL:rsi:x", {"task": asyncio.create_task(_fail()), "tickers": ["AAPL"],
+                              "indicator": "rsi", "signal_type": "x"})
+    running = asyncio.create_task(asyncio.sleep(10))
+    mgr._track("MSFT:rsi:x", {"task": running, "tickers": ["MSFT"],
+                              "indicator": "rsi", "signal_type": "x"})
+    await asyncio.sleep(0.01)
+
+    assert list(mgr.monitors) == ["MSFT:rsi:x"]
+    listed = mgr.list_monitors()
+    assert listed["AAPL:rsi:x"]["status"] == "failed: feed lost"
+    assert listed["MSFT:rsi:x"]["status"] == "running"
+
+    # Cancelled (stopped) monitors are not kept; history is bounded.
+    running.cancel()
+    monkeypatch.setattr(mm, "_FINISHED_KEEP", 1)
+    mgr._track("TSLA:rsi:x", {"task": asyncio.create_task(asyncio.sleep(0)), "tickers": ["TSLA"],
+                              "indicator": "rsi", "signal_type": "x"})
+    await asyncio.sleep(0.01)
+    assert not mgr.monitors
+    assert list(mgr.finished) == ["TSLA:rsi:x"]
+    assert mgr.finished["TSLA:rsi:x"]["status"] == "completed"
+
+
+def test_keys_ignore_ticker_order_and_repeats():
+    mgr = MonitorManager()
+    assert mgr._get_key(["MSFT", "AAPL", "MSFT"], "rsi", "x") == mgr._get_key(["AAPL", "MSFT"], "rsi", "x")
+    assert mgr._wave_key(["B", "A", "A"], "5m") == "wave:5m:A,B"
+
+
+@pytest.mark.asyncio
+async def test_stop_monitor_cancels_and_untracks():
+    class _Provider:
+        unsubscribed = None
+
+        def unsubscribe_bars(self, tickers):
+            self.unsubscribed = tickers
+
+    mgr = MonitorManager()
+    mgr.provider = _Provider()
+    task = asyncio.create_task(asyncio.sleep(10))
+    mgr._track("AAPL:rsi:x", {"task": task, "tickers": ["AAPL"],
+                              "indicator": "rsi", "signal_type": "x"})
+
+    res = await mgr.stop_monitor(["AAPL"], "rsi", "x")
+
+    assert res["status"] == "stopped"
+    assert task.cancelled()
+    assert not mgr.monitors and not mgr.finished
+    assert mgr.provider.unsubscribed == ["AAPL"]
+    assert (await mgr.stop_monitor(["AAPL"], "rsi", "x"))["status"] == "not_found"
@@ -0,0 +1,96 @@
+"""MonitorService emits each divergence once, not on every bar it stays detectable."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services.live.monitor_service import MonitorService
+
+T0 = datetime(2026, 3, 2, 14, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def svc(monkeypatch):
+    monkeypatch.setattr(settings, "lookback_bars", 5)
+    s = MonitorService(provider=None, indicator_name="rsi", signal_type="regular_bullish_divergence")
+    s.buffers["AAPL"] = s._new_buffer()
+    persisted, broadcast = [], []
+
+    async def _persist_bar(*_a):
+        return None
+
+    async def _persist_signal(symbol, result):
+        persisted.append((symbol, result["p1_ts"], result["p2_ts"]))
+
+    async def _broadcast(payload):
+        broadcast.append(payload)
+
+    s._persist_bar = _persist_bar
+    s._persist_signal = _persist_signal
+    s.broadcast_cb = _broadcast
+    return s, persisted, broadcast
+
+
+def _bar(i: int) -> SimpleNamespace:
+    return SimpleNamespace(symbol="AAPL", timestamp=T0 + timedelta(minutes=i),
+                           open=100.0, high=101.0, low=99.0, close=100.0 + i % 3, volume=10)
+
+
+def test_same_pivot_pair_emitted_once(svc) -> None:
+    s, persisted, broadcast = svc
+    pair_a = {"p1_ts": T0, "p2_ts": T0 + timedelta(minutes=2), "price": 99.0, "indicator_value": 30.0}
+    pair_b = {**pair_a, "p1_ts": T0 + timedelta(minutes=2), "p2_ts": T0 + timedelta(minutes=6)}
+    hits = iter([None, pair_a, pair_a, pair_b, pair_b])  # detector runs from bar 5
+    s.detector = lambda *a, **kw: next(hits)
+
+    async def _run():
+        for i in range(9):
+            await s._process_bar(_bar(i))
+
+    asyncio.run(_run())
+    assert [p[2] for p in persisted] == [pair_a["p2_ts"], pair_b["p2_ts"]]
+    assert len(broadcast) == 2
+
+
+def test_streamed_indicator_matches_window_recompute(svc) -> None:
+    s, _, _ = svc
+    seen = []
+    s.detector = lambda close, ind: seen.append((close.to_numpy(), ind.to_numpy()))
+
+    async def _run():
+        for i in range(30):
+            await s._process_bar(_bar(i))
+
+    asyncio.run(_run())
+    close, ind = seen[-1]
+    assert len(close) == len(ind) == 5  # only the detector's lookback window
+    buf = s.buffers["AAPL"]
+    streamed = buf.series("indicator").to_numpy()
+    np.testing.assert_array_equal(ind, streamed[-5:])
+    np.testing.assert_array_equal(close, buf.series("close").to_numpy()[-5:])
+    # Each bar keeps the value it had when it arrived: the first bars (no
+    # loss yet) stay at RSI's 50 fill where a recompute would backfill.
+    assert (streamed[:3] == 50.0).all()
+    np.testing.assert_array_equal(
+        streamed[3:], s.indicator.compute_array(buf.series("close").to_numpy())[3:]
+    )
+
+
+def test_stale_bars_skip_indicator_and_detection(svc) -> None:
+    s, _, _ = svc
+    calls = []
+    s.detector = lambda close, ind: calls.append(close.index[-1])
+
+    async def _run():
+        for i in (0, 1, 2, 3, 4, 5, 5, 3, 6):  # redelivered 5, late 3
+            await s._process_bar(_bar(i))
+
+    asyncio.run(_run())
+    assert len(s.buffers["AAPL"]) == 7
+    assert calls == [_bar(i).timestamp for i in (4, 5, 6)]
+    assert s.last_bar_time["AAPL"] == _bar(6).timestamp
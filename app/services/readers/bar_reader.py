@@ -66,7 +66,7 @@ def _row_to_live_bar(row: dict, interval: str, *, symbol: Optional[str] = None)
 
       - `list_bars_resampled` returns `ts` (not `timestamp`) and omits
         `symbol`, `vwap`, `trade_count`, `source`.
-      - `fetch_bars` / `list_bars_desc` use `timestamp`, also omit
+      - `fetch_bars` / `list_bars_latest` use `timestamp`, also omit
         symbol-level metadata.
       - `latest_bar_per_symbol` includes `symbol` and `ts`.
       - `list_daily_bars` uses `timestamp`.
@@ -108,8 +108,9 @@ class BarReader:
     ) -> list[LiveBar]:
         """
         Return the most recent `limit` 1-minute bars for `symbol`,
-        sorted oldest-first. Wraps `queries.list_bars_desc` and reverses
-        for ascending order (UIs and indicator code expect ASC).
+        sorted oldest-first. Wraps `queries.list_bars_latest` (which already
+        returns ASC); the sort is a cheap guard since UIs and indicator
+        code depend on ascending order.
 
         `source_table` selects the asset-class CH table (`ohlcv_1m`
         equities / `futures_ohlcv_1m` futures). Empty if `symbol` has no
@@ -119,7 +120,7 @@ class BarReader:
             return []
         from app.db import queries  # lazy: avoids pulling CH client at import time
 
-        rows = queries.list_bars_desc(symbol, limit, source_table=source_table)
+        rows = queries.list_bars_latest(symbol, limit, source_table=source_table)
         if not rows:
             return []
         bars = [_row_to_live_bar(r, "1m", symbol=symbol) for r in rows]
@@ -197,7 +197,9 @@ def _to_bars(df, sym: str, interval: str, resample_to: Optional[str]) -> list[Li
     if df is None or getattr(df, "empty", True):
         return []
     out: list[LiveBar] = []
-    for ts, row in df.iterrows():
+    # Plain tuples: iterrows() would build a Series per row.
+    cols = df[["open", "high", "low", "close", "volume"]]
+    for ts, o, h, l, c, v in cols.itertuples(index=True, name=None):
         t = ts.to_pydatetime() if hasattr(ts, "to_pydatetime") else ts
         if t.tzinfo is None:
             t = t.replace(tzinfo=timezone.utc)
@@ -205,11 +207,11 @@ def _to_bars(df, sym: str, interval: str, resample_to: Optional[str]) -> list[Li
             LiveBar(
                 symbol=sym,
                 timestamp=t,
-                open=float(row["open"]),
-                high=float(row["high"]),
-                low=float(row["low"]),
-                close=float(row["close"]),
-                volume=float(row["volume"]),
+                open=float(o),
+                high=float(h),
+                low=float(l),
+                close=float(c),
+                volume=float(v),
                 vwap=None,
                 trade_count=None,
                 source="schwab-ondemand",
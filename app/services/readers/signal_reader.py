@@ -13,6 +13,7 @@ Used by:
 from __future__ import annotations
 
 import logging
+from datetime import datetime
 from typing import Optional
 
 from app.services.readers.schemas import Signal
@@ -63,15 +64,19 @@ class SignalReader:
         return [_row_to_signal(r) for r in rows] if rows else []
 
     def get_signals_by_symbol(
-        self, symbol: Optional[str] = None, limit: int = 100
+        self,
+        symbol: Optional[str] = None,
+        limit: int = 100,
+        before: Optional[datetime] = None,
     ) -> list[Signal]:
         """
         Return signals filtered by `symbol` (or all symbols if None),
-        newest-first.
+        newest-first. `before` pages backwards: pass the oldest
+        `ts_signal` already seen.
         """
         if limit <= 0:
             return []
         from app.db import queries
 
-        rows = queries.list_signals(symbol, limit)
+        rows = queries.list_signals(symbol, limit, before=before)
         return [_row_to_signal(r) for r in rows] if rows else []
@@ -57,10 +57,10 @@ def _ch_row(ts_minute: int, **overrides) -> dict:
     }
 
 
-def test_bar_reader_get_recent_bars_reverses_to_asc() -> None:
-    """list_bars_desc returns DESC; reader must flip to ASC."""
+def test_bar_reader_get_recent_bars_sorts_to_asc() -> None:
+    """list_bars_latest returns ASC; the reader's sort still guards order."""
     desc_rows = [_ch_row(m) for m in (10, 9, 8, 7, 6)]
-    with patch("app.db.queries.list_bars_desc", return_value=desc_rows):
+    with patch("app.db.queries.list_bars_latest", return_value=desc_rows):
         bars = BarReader().get_recent_bars("AAPL", limit=5)
 
     assert len(bars) == 5
@@ -71,7 +71,7 @@ def test_bar_reader_get_recent_bars_reverses_to_asc() -> None:
 
 def test_bar_reader_get_recent_bars_zero_limit_skips_query() -> None:
     """limit=0 -> [] without hitting CH."""
-    with patch("app.db.queries.list_bars_desc") as q:
+    with patch("app.db.queries.list_bars_latest") as q:
         bars = BarReader().get_recent_bars("AAPL", limit=0)
     assert bars == []
     q.assert_not_called()
@@ -342,10 +342,17 @@ def test_signal_reader_get_signals_by_symbol() -> None:
     rows = [_signal_row(i) for i in range(2)]
     with patch("app.db.queries.list_signals", return_value=rows) as q:
         signals = SignalReader().get_signals_by_symbol("AAPL", limit=50)
-    q.assert_called_once_with("AAPL", 50)
+    q.assert_called_once_with("AAPL", 50, before=None)
     assert len(signals) == 2
 
 
+def test_signal_reader_passes_keyset_cursor() -> None:
+    cursor = datetime(2024, 8, 1, 14, 0, tzinfo=timezone.utc)
+    with patch("app.db.queries.list_signals", return_value=[_signal_row(0)]) as q:
+        SignalReader().get_signals_by_symbol("AAPL", limit=50, before=cursor)
+    q.assert_called_once_with("AAPL", 50, before=cursor)
+
+
 def test_signal_reader_zero_limit_skips_query() -> None:
     with patch("app.db.queries.recent_signals") as q:
         assert SignalReader().get_recent_signals(limit=0) == []
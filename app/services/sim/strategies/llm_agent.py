@@ -332,7 +332,9 @@ class LLMAgentStrategy:
         stable across runs.
         """
         p = self.params
-        df = ctx.history.to_dataframe().tail(p.context_bars)
+        # The close Series is cached per bar and shared with ctx.indicator();
+        # to_dataframe() would build all five columns just for this trail.
+        closes = ctx.history.series("close").tail(p.context_bars)
         bar = ctx.bar
         portfolio = ctx.portfolio
 
@@ -361,7 +363,7 @@ class LLMAgentStrategy:
             position_line = "No current position."
 
         # Last-N close trail. Truncate to keep the prompt token-bounded.
-        closes_trail = ", ".join(f"{c:.2f}" for c in df["close"].tolist())
+        closes_trail = ", ".join(f"{c:.2f}" for c in closes.tolist())
 
         return (
             f"Symbol: {bar.symbol}\n"
@@ -369,7 +371,7 @@ class LLMAgentStrategy:
             f"Interval: {self.interval}\n"
             f"Current bar OHLCV: O={bar.open:.2f} H={bar.high:.2f} L={bar.low:.2f} "
             f"C={bar.close:.2f} V={int(bar.volume)}\n\n"
-            f"Last {len(df)} closes (oldest first): {closes_trail}\n\n"
+            f"Last {len(closes)} closes (oldest first): {closes_trail}\n\n"
             f"Indicators at current bar:\n" + "\n".join(ind_lines) + "\n\n"
             f"Portfolio:\n"
             f"  Cash: ${portfolio.cash:.2f}\n"
@@ -66,10 +66,19 @@ References:
 """
 
 from __future__ import annotations
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 from typing import Optional, Dict, List
 from app.config import settings
 
+try:  # optional C moving min/max (pandas' "performance" extra)
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
 
 def _ema(series: pd.Series, period: int) -> pd.Series:
     """
@@ -87,7 +96,198 @@ def _ema(series: pd.Series, period: int) -> pd.Series:
     return series.ewm(span=period, adjust=False).mean()
 
 
-def find_pivot_lows(close: pd.Series, k: int, strict: bool = True) -> List[pd.Timestamp]:
+@lru_cache(maxsize=64)
+def _ema_weights(n: int, period: int) -> np.ndarray:
+    """Read-only weights for `_ema_last`; windows are almost always `lookback` long."""
+    alpha = 2.0 / (period + 1)
+    w = alpha * (1.0 - alpha) ** np.arange(n - 1, -1, -1, dtype=np.float64)
+    w[0] = (1.0 - alpha) ** (n - 1)
+    w.flags.writeable = False
+    return w
+
+
+def _ema_last(values: np.ndarray, period: int) -> float:
+    """
+    Last value of `_ema(values, period)`, computed on a bare ndarray.
+
+    With adjust=False the EMA is a fixed geometric weighting of the
+    inputs (the first bar carries the leftover weight), so the final
+    value is a single dot product — no Series construction, no ewm
+    machinery, and (weights cached per length) no allocation. Callers
+    pass NaN-free data.
+    """
+    return float(_ema_weights(len(values), period) @ values)
+
+
+def _pivot_mask(vals: np.ndarray, k: int, low: bool, strict: bool = True) -> np.ndarray:
+    """
+    Boolean mask (shape of vals) of pivot lows/highs along the last axis —
+    the kernel behind `find_pivot_lows`/`find_pivot_highs`,
+    `scan_divergences` and `pivot_positions_batch`.
+
+    Evaluates every candidate at once over a sliding (2k+1)-bar view
+    instead of a Python loop per bar. Reductions skip NaN like
+    Series.min()/max() (all-NaN -> NaN, so comparisons are False); the
+    first and last k bars are never pivots. Strict masks over NaN-free
+    data, the live default, skip the view for 2k shifted comparisons.
+    """
+    n = vals.shape[-1]
+    mask = np.zeros(vals.shape, dtype=bool)
+    if n < 2 * k + 1:
+        return mask
+
+    beats = np.less if low else np.greater
+    if strict and k > 0 and not np.isnan(vals.sum()):
+        # NaN-free window (the normal case): a strict pivot just beats each
+        # of its 2k neighbours, so compare against 2k shifted slices
+        # instead of reducing windows.
+        mask[..., k:n - k] = _strict_hits_clean(vals, k, beats)
+        return mask
+    if bn is not None and k > 0:
+        mask[..., k:n - k] = _pivot_hits_bn(vals, k, low, strict, beats)
+        return mask
+
+    reduce = np.fmin.reduce if low else np.fmax.reduce
+    win = np.lib.stride_tricks.sliding_window_view(vals, 2 * k + 1, axis=-1)
+    c = win[..., k]
+    if strict:
+        # Strictly beating every bar on the left AND right side already
+        # makes it the window extreme, so the full-window pass is skipped.
+        hit = beats(c, reduce(win[..., :k], axis=-1, initial=np.nan))
+        hit &= beats(c, reduce(win[..., k + 1:], axis=-1, initial=np.nan))
+    else:
+        # Current bar is the min (max) of the window [i-k, i+k]
+        hit = c == reduce(win, axis=-1, initial=np.nan)
+    mask[..., k:n - k] = hit
+    return mask
+
+
+def _strict_hits_clean(vals: np.ndarray, k: int, beats) -> np.ndarray:
+    """Strict-pivot hits for bars k..n-k-1 of a NaN-free `vals`."""
+    n = vals.shape[-1]
+    c = vals[..., k:n - k]
+    hit = np.ones(c.shape, dtype=bool)
+    tmp = np.empty_like(hit)
+    for j in range(1, k + 1):
+        hit &= beats(c, vals[..., k - j:n - k - j], out=tmp)
+        hit &= beats(c, vals[..., k + j:n - k + j], out=tmp)
+    return hit
+
+
+def _pivot_hits_bn(vals: np.ndarray, k: int, low: bool, strict: bool, beats) -> np.ndarray:
+    """
+    `_pivot_mask`'s hits for bars k..n-k-1, on bottleneck's trailing
+    move_min/move_max. min_count=1 gives the same NaN handling as the
+    fmin/fmax reductions.
+    """
+    n = vals.shape[-1]
+    move = bn.move_min if low else bn.move_max
+    c = vals[..., k:n - k]
+    if strict:
+        # side[j] = extreme of vals[j-k+1 .. j]; the left window of bar i
+        # ends at i-1, the right one at i+k.
+        side = move(vals, k, min_count=1, axis=-1)
+        hit = beats(c, side[..., k - 1:n - k - 1]) & beats(c, side[..., 2 * k:])
+    else:
+        hit = c == move(vals, 2 * k + 1, min_count=1, axis=-1)[..., 2 * k:]
+    return hit
+
+
+def pivot_positions(
+    values: np.ndarray, k: int, low: bool, strict: bool = True, max_pivots: Optional[int] = None
+) -> np.ndarray:
+    """
+    Integer positions (int64, ascending) of the pivot lows (`low=True`)
+    or highs in `values` — same rule as `find_pivot_lows`/`find_pivot_highs`
+    without boxing a Timestamp per pivot. `max_pivots` keeps only the
+    most recent N. Map back with `to_timestamps`.
+    """
+    pos = np.flatnonzero(_pivot_mask(values, k, low=low, strict=strict))
+    return pos if max_pivots is None else pos[-max_pivots:]
+
+
+def pivot_positions_batch(
+    values: np.ndarray, k: int, low: bool, strict: bool = True
+) -> List[np.ndarray]:
+    """
+    `pivot_positions` for many symbols at once. `values` is (M, N) — one
+    row per symbol, shorter histories left-padded with NaN — and the
+    whole matrix goes through one vectorised pass instead of M calls.
+    Returns one position array per row.
+    """
+    return [np.flatnonzero(row) for row in _pivot_mask(values, k, low=low, strict=strict)]
+
+
+def to_timestamps(positions: np.ndarray, index: pd.Index) -> List[pd.Timestamp]:
+    """Timestamps for `pivot_positions` output, given the series' index."""
+    return list(index[positions])
+
+
+class PivotStream:
+    """
+    Bar-at-a-time pivot confirmation, same rule as `pivot_positions`.
+
+    Keeps one monotonic deque per side (Lemire's sliding-window min/max)
+    over the last 2k+1 bars, so `push` is amortised O(1) regardless of
+    history length: bar i is confirmed or rejected when bar i+k arrives.
+    NaN closes are never pivots and are skipped as neighbours, like the
+    NaN-aware reductions in `_pivot_mask`.
+    """
+
+    def __init__(self, k: int, strict: bool = True) -> None:
+        if k < 1:
+            raise ValueError(f"PivotStream k must be >= 1, got {k}")
+        self.k = k
+        self.strict = strict
+        self._n = 0
+        self._ring: deque = deque(maxlen=2 * k + 1)  # last 2k+1 closes
+        self._low: deque = deque()    # (pos, value), values non-decreasing
+        self._high: deque = deque()   # (pos, value), values non-increasing
+        # Fixed for the stream's life, so pick the rule once, not per bar.
+        self._confirmed = self._confirmed_strict if strict else self._confirmed_ties
+
+    def push(self, value: float) -> tuple[Optional[int], Optional[int]]:
+        """
+        Add the next close. Returns `(low_pos, high_pos)`: the position of
+        the bar k back if this bar confirms it as a pivot low / high,
+        else None for that side.
+        """
+        i = self._n
+        self._n += 1
+        self._ring.append(value)
+        if value == value:  # not NaN
+            while self._low and self._low[-1][1] > value:
+                self._low.pop()
+            self._low.append((i, value))
+            while self._high and self._high[-1][1] < value:
+                self._high.pop()
+            self._high.append((i, value))
+        for d in (self._low, self._high):
+            while d and d[0][0] < i - 2 * self.k:
+                d.popleft()
+        if i < 2 * self.k:
+            return None, None
+        return self._confirmed(self._low, i - self.k), self._confirmed(self._high, i - self.k)
+
+    def _confirmed_ties(self, d: deque, center: int) -> Optional[int]:
+        # Ties allowed: the centre only has to equal the window extreme.
+        c = self._ring[self.k]
+        return center if d and d[0][1] == c else None
+
+    def _confirmed_strict(self, d: deque, center: int) -> Optional[int]:
+        # The centre is the earliest extreme and no later bar ties it,
+        # with at least one real bar on each side.
+        c = self._ring[self.k]
+        if c != c or not d or d[0][0] != center or (len(d) > 1 and d[1][1] == c):
+            return None
+        ring = list(self._ring)
+        sides_ok = any(v == v for v in ring[:self.k]) and any(v == v for v in ring[self.k + 1:])
+        return center if sides_ok else None
+
+
+def find_pivot_lows(
+    close: pd.Series, k: int, strict: bool = True, max_pivots: Optional[int] = None
+) -> List[pd.Timestamp]:
     """
     Find pivot lows (local minima/troughs) in a price series.
     
@@ -113,6 +313,7 @@ def find_pivot_lows(close: pd.Series, k: int, strict: bool = True) -> List[pd.Ti
         k: Number of bars on each side for comparison (window size)
         strict: If True, pivot must be strictly lower than ALL surrounding bars
                If False, only needs to be minimum in window (allows flat pivots)
+        max_pivots: If set, return only the most recent `max_pivots` pivots
     
     Returns:
         List of timestamps where pivot lows occur
@@ -122,28 +323,13 @@ def find_pivot_lows(close: pd.Series, k: int, strict: bool = True) -> List[pd.Ti
         - Larger k = more significant pivots but fewer detected
         - strict=False allows detection when prices are flat/choppy
     """
-    idxs = []
-    n = len(close)
-    vals = close.values
-    
-    # Iterate through potential pivot points (excluding edges)
-    for i in range(k, n - k):
-        # Get surrounding bars
-        left = close.iloc[i - k:i]      # k bars before
-        right = close.iloc[i + 1:i + k + 1]  # k bars after
-        c = vals[i]  # Current bar value
-        
-        # Check if this is the minimum in the window [i-k, i+k]
-        if c == close.iloc[i - k:i + k + 1].min():
-            # Strict mode: Must be LOWER than all left AND all right bars
-            # Non-strict: Just being the minimum is sufficient
-            if not strict or (c < left.min() and c < right.min()):
-                idxs.append(close.index[i])
-    
-    return idxs
+    pos = pivot_positions(close.to_numpy(dtype=np.float64), k, True, strict, max_pivots)
+    return to_timestamps(pos, close.index)
 
 
-def find_pivot_highs(close: pd.Series, k: int, strict: bool = True) -> List[pd.Timestamp]:
+def find_pivot_highs(
+    close: pd.Series, k: int, strict: bool = True, max_pivots: Optional[int] = None
+) -> List[pd.Timestamp]:
     """
     Find pivot highs (local maxima/peaks) in a price series.
     
@@ -169,6 +355,7 @@ def find_pivot_highs(close: pd.Series, k: int, strict: bool = True) -> List[pd.T
         k: Number of bars on each side for comparison (window size)
         strict: If True, pivot must be strictly higher than ALL surrounding bars
                If False, only needs to be maximum in window (allows flat pivots)
+        max_pivots: If set, return only the most recent `max_pivots` pivots
     
     Returns:
         List of timestamps where pivot highs occur
@@ -178,103 +365,67 @@ def find_pivot_highs(close: pd.Series, k: int, strict: bool = True) -> List[pd.T
         - Larger k = more significant pivots but fewer detected
         - strict=False allows detection when prices are flat/choppy
     """
-    idxs = []
-    n = len(close)
-    vals = close.values
-    
-    # Iterate through potential pivot points (excluding edges)
-    for i in range(k, n - k):
-        # Get surrounding bars
-        left = close.iloc[i - k:i]      # k bars before
-        right = close.iloc[i + 1:i + k + 1]  # k bars after
-        c = vals[i]  # Current bar value
-        
-        # Check if this is the maximum in the window [i-k, i+k]
-        if c == close.iloc[i - k:i + k + 1].max():
-            # Strict mode: Must be HIGHER than all left AND all right bars
-            # Non-strict: Just being the maximum is sufficient
-            if not strict or (c > left.max() and c > right.max()):
-                idxs.append(close.index[i])
-    
-    return idxs
+    pos = pivot_positions(close.to_numpy(dtype=np.float64), k, False, strict, max_pivots)
+    return to_timestamps(pos, close.index)
 
 
-def _bull_trend_ok(close: pd.Series) -> bool:
+def _window(close: pd.Series, ind: pd.Series, lookback: int) -> tuple[pd.Series, pd.Series]:
     """
-    Check if price is in bullish trend (above EMA).
-    
-    Bullish divergences are more reliable when price is already above
-    the trend EMA, confirming upward momentum structure.
-    
-    Conditions:
-    -----------
-    1. If trend filter disabled: Always returns True (no filter)
-    2. Sufficient data: Need at least EMA_PERIOD + 5 bars
-    3. Current price > EMA: Confirms bullish trend structure
-    
-    Args:
-        close: Price series to analyze
-    
-    Returns:
-        bool: True if bullish trend confirmed (or filter disabled)
-    
-    Example:
-        >>> close = pd.Series([100, 101, 102, 103, 104])
-        >>> _bull_trend_ok(close)  # True if last price > 50 EMA
+    Last `lookback` bars of `close` and the matching `ind` values.
+
+    Indicators are normally computed from the same frame as `close`, so
+    their index is equal and a positional tail suffices; only a
+    misaligned `ind` pays for the label reindex. Inputs already no longer
+    than `lookback` are returned as they are.
     """
-    # Bypass if trend filter is disabled
-    if not settings.use_trend_filter:
-        return True
-    
-    # Remove NaN values
-    s = close.dropna()
-    
-    # Ensure sufficient data for EMA calculation
-    if len(s) < settings.ema_period + 5:
-        return False
-    
-    # Calculate EMA and check if price is above it
-    e = _ema(s, settings.ema_period)
-    return s.iloc[-1] > e.iloc[-1]
+    # The live monitor already hands over exactly the window; `tail`
+    # would still slice-copy both Series on every bar.
+    sub_close = close if len(close) <= lookback else close.tail(lookback)
+    if ind.index.equals(close.index):
+        return sub_close, ind if len(ind) <= lookback else ind.tail(lookback)
+    return sub_close, ind.reindex(sub_close.index)
 
 
-def _bear_trend_ok(close: pd.Series) -> bool:
+def _trend_status(values: np.ndarray) -> tuple[bool, bool]:
     """
-    Check if price is in bearish trend (below EMA).
-    
-    Bearish divergences are more reliable when price is already below
-    the trend EMA, confirming downward momentum structure.
-    
-    Conditions:
-    -----------
-    1. If trend filter disabled: Always returns True (no filter)
-    2. Sufficient data: Need at least EMA_PERIOD + 5 bars
-    3. Current price < EMA: Confirms bearish trend structure
-    
-    Args:
-        close: Price series to analyze
-    
-    Returns:
-        bool: True if bearish trend confirmed (or filter disabled)
-    
-    Example:
-        >>> close = pd.Series([104, 103, 102, 101, 100])
-        >>> _bear_trend_ok(close)  # True if last price < 50 EMA
+    (bull_ok, bear_ok) for one window — a single EMA serves both sides.
+
+    Both True when the filter is off; otherwise needs EMA_PERIOD + 5
+    non-NaN bars and the last price above (bull) / below (bear) the EMA.
     """
     # Bypass if trend filter is disabled
     if not settings.use_trend_filter:
-        return True
+        return True, True
     
-    # Remove NaN values
-    s = close.dropna()
+    # Remove NaN values. Finalized bars almost never have any, and a NaN
+    # anywhere makes the sum NaN, so the clean case costs one reduction
+    # and no copy.
+    s = values[~np.isnan(values)] if np.isnan(values.sum()) else values
     
     # Ensure sufficient data for EMA calculation
     if len(s) < settings.ema_period + 5:
-        return False
+        return False, False
     
-    # Calculate EMA and check if price is below it
-    e = _ema(s, settings.ema_period)
-    return s.iloc[-1] < e.iloc[-1]
+    e = _ema_last(s, settings.ema_period)
+    return bool(s[-1] > e), bool(s[-1] < e)
+
+
+def _trend_ok(values: np.ndarray, bullish: bool) -> bool:
+    """
+    Trend filter for one side: last price above (bullish) / below
+    (bearish) the EMA_PERIOD EMA. See `_trend_status`.
+    """
+    return _trend_status(values)[0 if bullish else 1]
+
+
+def _hit(sub_close: pd.Series, c: np.ndarray, v: np.ndarray, p1: int, p2: int) -> Dict:
+    """Detector result for the pivot pair at window positions p1 < p2."""
+    return {
+        "p1_ts": sub_close.index[p1],
+        "p2_ts": sub_close.index[p2],
+        "price": float(c[p2]),
+        "indicator_value": float(v[p2]),
+    }
 
 
 def detect_hidden_bullish(
@@ -342,30 +493,29 @@ def detect_hidden_bullish(
         min_pivot_separation = settings.min_pivot_separation
     
     # Get recent data window
-    sub_close = close.tail(lookback)
-    sub_ind = ind.reindex(sub_close.index)
+    sub_close, sub_ind = _window(close, ind, lookback)
+    c = sub_close.to_numpy(dtype=np.float64)
+    v = sub_ind.to_numpy(dtype=np.float64)
     
-    # Find pivot lows in price
-    piv = find_pivot_lows(sub_close, k)
+    # Find pivot lows in price (positions within the window)
+    piv = pivot_positions(c, k, low=True, max_pivots=2)
     
     # Need at least 2 pivots to compare
     if len(piv) < 2:
         return None
     
     # Get last two pivot points
-    p1, p2 = piv[-2], piv[-1]
+    p1, p2 = int(piv[0]), int(piv[1])
     
     # Check minimum separation
-    p1_idx = sub_close.index.get_loc(p1)
-    p2_idx = sub_close.index.get_loc(p2)
-    if p2_idx - p1_idx < min_pivot_separation:
+    if p2 - p1 < min_pivot_separation:
         return None
     
     # Check divergence conditions
-    if sub_close.loc[p2] > sub_close.loc[p1] and sub_ind.loc[p2] < sub_ind.loc[p1]:
+    if c[p2] > c[p1] and v[p2] < v[p1]:
         # Use config thresholds (RELAXED for 1-minute data)
-        price_change_pct = abs(sub_close.loc[p2] - sub_close.loc[p1]) / sub_close.loc[p1]
-        ind_change_pct = abs(sub_ind.loc[p2] - sub_ind.loc[p1]) / abs(sub_ind.loc[p1] + 0.01)
+        price_change_pct = abs(c[p2] - c[p1]) / c[p1]
+        ind_change_pct = abs(v[p2] - v[p1]) / abs(v[p1] + 0.01)
         
         if price_change_pct < settings.min_price_change_pct:
             return None
@@ -375,15 +525,10 @@ def detect_hidden_bullish(
         
         # Trend filter (DISABLED by default in config)
         if settings.use_trend_filter:
-            if not _bull_trend_ok(sub_close):
+            if not _trend_ok(c, bullish=True):
                 return None
         
-        return {
-            "p1_ts": p1,
-            "p2_ts": p2,
-            "price": sub_close.loc[p2],
-            "indicator_value": sub_ind.loc[p2]
-        }
+        return _hit(sub_close, c, v, p1, p2)
     
     return None
 
@@ -446,33 +591,29 @@ def detect_hidden_bearish(
         >>>     print(f"Hidden bearish at {div['p2_ts']}: ${div['price']:.2f}")
     """
     # Get recent data window
-    sub_close = close.tail(lookback)
-    sub_ind = ind.reindex(sub_close.index)
+    sub_close, sub_ind = _window(close, ind, lookback)
+    c = sub_close.to_numpy(dtype=np.float64)
+    v = sub_ind.to_numpy(dtype=np.float64)
     
-    # Find pivot highs in price
-    piv = find_pivot_highs(sub_close, k)
+    # Find pivot highs in price (positions within the window)
+    piv = pivot_positions(c, k, low=False, max_pivots=2)
     
     # Need at least 2 pivots to compare
     if len(piv) < 2:
         return None
     
     # Get last two pivot points
-    p1, p2 = piv[-2], piv[-1]
+    p1, p2 = int(piv[0]), int(piv[1])
     
     # Check divergence conditions:
     # 1. Price: Lower high (p2 < p1) - bearish price structure
     # 2. Indicator: Higher high (p2 > p1) - momentum strengthening
-    if sub_close.loc[p2] < sub_close.loc[p1] and sub_ind.loc[p2] > sub_ind.loc[p1]:
+    if c[p2] < c[p1] and v[p2] > v[p1]:
         # Apply trend filter (ensure we're in downtrend)
-        if not _bear_trend_ok(sub_close):
+        if not _trend_ok(c, bullish=False):
             return None
         
-        return {
-            "p1_ts": p1,
-            "p2_ts": p2,
-            "price": sub_close.loc[p2],
-            "indicator_value": sub_ind.loc[p2]
-        }
+        return _hit(sub_close, c, v, p1, p2)
     
     return None
 
@@ -528,33 +669,29 @@ def detect_regular_bullish(
         >>>     print(f"🚨 Potential reversal at {div['p2_ts']}")
     """
     # Get recent data window
-    sub_close = close.tail(lookback)
-    sub_ind = ind.reindex(sub_close.index)
+    sub_close, sub_ind = _window(close, ind, lookback)
+    c = sub_close.to_numpy(dtype=np.float64)
+    v = sub_ind.to_numpy(dtype=np.float64)
     
-    # Find pivot lows in price
-    piv = find_pivot_lows(sub_close, k)
+    # Find pivot lows in price (positions within the window)
+    piv = pivot_positions(c, k, low=True, max_pivots=2)
     
     # Need at least 2 pivots to compare
     if len(piv) < 2:
         return None
     
     # Get last two pivot points
-    p1, p2 = piv[-2], piv[-1]
+    p1, p2 = int(piv[0]), int(piv[1])
     
     # Check divergence conditions:
     # 1. Price: Lower low (p2 < p1) - still in downtrend
     # 2. Indicator: Higher low (p2 > p1) - momentum improving
-    if sub_close.loc[p2] < sub_close.loc[p1] and sub_ind.loc[p2] > sub_ind.loc[p1]:
+    if c[p2] < c[p1] and v[p2] > v[p1]:
         # Apply trend filter
-        if not _bull_trend_ok(sub_close):
+        if not _trend_ok(c, bullish=True):
             return None
         
-        return {
-            "p1_ts": p1,
-            "p2_ts": p2,
-            "price": sub_close.loc[p2],
-            "indicator_value": sub_ind.loc[p2]
-        }
+        return _hit(sub_close, c, v, p1, p2)
     
     return None
 
@@ -610,32 +747,228 @@ def detect_regular_bearish(
         >>>     print(f"🚨 Potential reversal at {div['p2_ts']}")
     """
     # Get recent data window
-    sub_close = close.tail(lookback)
-    sub_ind = ind.reindex(sub_close.index)
+    sub_close, sub_ind = _window(close, ind, lookback)
+    c = sub_close.to_numpy(dtype=np.float64)
+    v = sub_ind.to_numpy(dtype=np.float64)
     
-    # Find pivot highs in price
-    piv = find_pivot_highs(sub_close, k)
+    # Find pivot highs in price (positions within the window)
+    piv = pivot_positions(c, k, low=False, max_pivots=2)
     
     # Need at least 2 pivots to compare
     if len(piv) < 2:
         return None
     
     # Get last two pivot points
-    p1, p2 = piv[-2], piv[-1]
+    p1, p2 = int(piv[0]), int(piv[1])
     
     # Check divergence conditions:
     # 1. Price: Higher high (p2 > p1) - still in uptrend
     # 2. Indicator: Lower high (p2 < p1) - momentum weakening
-    if sub_close.loc[p2] > sub_close.loc[p1] and sub_ind.loc[p2] < sub_ind.loc[p1]:
+    if c[p2] > c[p1] and v[p2] < v[p1]:
         # Apply trend filter
-        if not _bear_trend_ok(sub_close):
+        if not _trend_ok(c, bullish=False):
             return None
         
-        return {
-            "p1_ts": p1,
-            "p2_ts": p2,
-            "price": sub_close.loc[p2],
-            "indicator_value": sub_ind.loc[p2]
-        }
+        return _hit(sub_close, c, v, p1, p2)
     
     return None
+
+
+# ─────────────────────────────────────────────────────────────────────
+# Whole-history scan
+# ─────────────────────────────────────────────────────────────────────
+#
+# The detect_* functions above answer "does the window ending NOW hold a
+# divergence?". Replaying them bar-by-bar over a long history re-slices a
+# growing Series and re-finds every pivot on each step — O(N * lookback)
+# pandas work. `scan_divergences` produces the same events in one pass:
+# a pivot's status depends only on its own 2k+1 neighbourhood, so pivots
+# are found once over the full series and each consecutive pivot pair is
+# evaluated once, at the bar where the live detector would first see it.
+
+# kind -> (pivot side, bullish?, price/indicator predicate on (c1, c2, v1, v2))
+_SCAN_KINDS = {
+    "hidden_bullish": ("low", True, lambda c1, c2, v1, v2: c2 > c1 and v2 < v1),
+    "hidden_bearish": ("high", False, lambda c1, c2, v1, v2: c2 < c1 and v2 > v1),
+    "regular_bullish": ("low", True, lambda c1, c2, v1, v2: c2 < c1 and v2 > v1),
+    "regular_bearish": ("high", False, lambda c1, c2, v1, v2: c2 > c1 and v2 < v1),
+}
+
+SCAN_COLUMNS = ["ts", "p1_ts", "p2_ts", "price", "indicator_value"]
+
+
+def scan_divergences(
+    close: pd.Series,
+    ind: pd.Series,
+    kind: str,
+    lookback: int,
+    k: int,
+    min_pivot_separation: int = 20,
+    trend_cache: Optional[Dict[int, tuple[bool, bool]]] = None,
+) -> pd.DataFrame:
+    """
+    Find every divergence of `kind` across the full history in one pass.
+
+    Equivalent to calling the matching `detect_<kind>` on
+    `close.iloc[:i + 1]` for every bar i and keeping the first hit per
+    pivot pair — without the per-bar re-slicing. Intended for backfills
+    and research; the live monitor keeps calling the detectors directly.
+
+    Args:
+        close: Price series (close prices), NaN-free
+        ind: Indicator series aligned to `close` (reindexed if not)
+        kind: One of "hidden_bullish", "hidden_bearish",
+              "regular_bullish", "regular_bearish"
+        lookback: Window length the live detector would use (e.g. 60)
+        k: Pivot detection window size (e.g. 3)
+        min_pivot_separation: Hidden-bullish only, mirrors
+              `detect_hidden_bullish`
+        trend_cache: Optional dict shared across calls on the same
+              `close`/`lookback` (e.g. all four kinds for one symbol) so
+              each bar's trend EMA is computed once, not once per kind
+
+    Returns:
+        DataFrame with columns `SCAN_COLUMNS` — `ts` is the bar at which
+        the divergence is first detectable, the rest match the detector
+        dict. Empty (same columns) when nothing fires.
+    """
+    if kind not in _SCAN_KINDS:
+        raise ValueError(f"Unknown divergence kind {kind!r}. Supported: {sorted(_SCAN_KINDS)}")
+    side, bullish, predicate = _SCAN_KINDS[kind]
+
+    if not ind.index.equals(close.index):
+        ind = ind.reindex(close.index)
+    c = close.to_numpy(dtype=np.float64)
+    v = ind.to_numpy(dtype=np.float64)
+    n = len(c)
+    piv = pivot_positions(c, k, low=(side == "low"))
+
+    rows = []
+    for a in range(1, len(piv)):
+        p1, p2 = int(piv[a - 1]), int(piv[a])
+        if not predicate(c[p1], c[p2], v[p1], v[p2]):
+            continue
+        if kind == "hidden_bullish":
+            if p2 - p1 < min_pivot_separation:
+                continue
+            if abs(c[p2] - c[p1]) / c[p1] < settings.min_price_change_pct:
+                continue
+            if abs(v[p2] - v[p1]) / abs(v[p1] + 0.01) < settings.min_indicator_change_pct:
+                continue
+
+        # The pair is the window's "last two pivots" from the bar that
+        # confirms p2 until the next pivot is confirmed or p1's left
+        # context scrolls out of the lookback window.
+        first = p2 + k
+        last = min(n - 1, p1 - k + lookback - 1)
+        if a + 1 < len(piv):
+            last = min(last, int(piv[a + 1]) + k - 1)
+
+        for i in range(first, last + 1):
+            # Trend filter depends on the window, so it is the only check
+            # that can change across the pair's lifetime.
+            status = trend_cache.get(i) if trend_cache is not None else None
+            if status is None:
+                status = _trend_status(c[max(0, i - lookback + 1):i + 1])
+                if trend_cache is not None:
+                    trend_cache[i] = status
+            if status[0 if bullish else 1]:
+                rows.append((close.index[i], close.index[p1], close.index[p2], c[p2], v[p2]))
+                break
+
+    return pd.DataFrame(rows, columns=SCAN_COLUMNS)
+
+
+def scan_divergences_by_symbol(
+    df,
+    kind: str,
+    lookback: int,
+    k: int,
+    *,
+    ind_col: str = "indicator",
+    min_pivot_separation: int = 20,
+):
+    """
+    `scan_divergences` over a multi-symbol Polars frame.
+
+    `df` is long-format — `symbol`, `timestamp`, `close` and `ind_col`
+    columns, e.g. a `read_arrow` result with the indicator attached —
+    and is sorted and split per symbol here, so the caller does not
+    need to round-trip the whole frame through pandas.
+
+    Returns a Polars DataFrame with `symbol` followed by `SCAN_COLUMNS`.
+    """
+    import polars as pl
+
+    if kind not in _SCAN_KINDS:
+        raise ValueError(f"Unknown divergence kind {kind!r}. Supported: {sorted(_SCAN_KINDS)}")
+    parts = df.sort("symbol", "timestamp").partition_by("symbol", as_dict=True, maintain_order=True)
+    frames = []
+    for (symbol,), part in parts.items():
+        index = pd.DatetimeIndex(part["timestamp"].to_pandas())
+        events = scan_divergences(
+            pd.Series(part["close"].to_numpy(), index=index),
+            pd.Series(part[ind_col].to_numpy(), index=index),
+            kind,
+            lookback=lookback,
+            k=k,
+            min_pivot_separation=min_pivot_separation,
+        )
+        if not events.empty:
+            frames.append(events.assign(symbol=symbol))
+    if not frames:
+        return pl.DataFrame(schema={"symbol": pl.String, **{c: pl.Null for c in SCAN_COLUMNS}})
+    return pl.from_pandas(pd.concat(frames, ignore_index=True)[["symbol", *SCAN_COLUMNS]])
+
+
+# ─────────────────────────────────────────────────────────────────────
+# All four kinds on one window
+# ─────────────────────────────────────────────────────────────────────
+
+
+def detect_divergences(
+    close: pd.Series,
+    ind: pd.Series,
+    lookback: int,
+    k: int,
+    min_pivot_separation: int = 20,
+) -> Dict[str, Optional[Dict]]:
+    """
+    Run all four detectors over the same window in one pass.
+
+    Returns `{kind: detector_result}` for the kinds in `_SCAN_KINDS`
+    ("hidden_bullish", ...), each value identical to what the matching
+    `detect_<kind>` returns. The window, the pivot lows/highs and the
+    trend EMA are computed once and shared, instead of once per detector.
+    """
+    sub_close, sub_ind = _window(close, ind, lookback)
+    c = sub_close.to_numpy(dtype=np.float64)
+    v = sub_ind.to_numpy(dtype=np.float64)
+    pivots = {
+        "low": pivot_positions(c, k, low=True, max_pivots=2),
+        "high": pivot_positions(c, k, low=False, max_pivots=2),
+    }
+    trend = None  # computed on first use only
+
+    out: Dict[str, Optional[Dict]] = {}
+    for kind, (side, bullish, predicate) in _SCAN_KINDS.items():
+        out[kind] = None
+        piv = pivots[side]
+        if len(piv) < 2:
+            continue
+        p1, p2 = int(piv[0]), int(piv[1])
+        if not predicate(c[p1], c[p2], v[p1], v[p2]):
+            continue
+        if kind == "hidden_bullish":
+            if p2 - p1 < min_pivot_separation:
+                continue
+            if abs(c[p2] - c[p1]) / c[p1] < settings.min_price_change_pct:
+                continue
+            if abs(v[p2] - v[p1]) / abs(v[p1] + 0.01) < settings.min_indicator_change_pct:
+                continue
+        if trend is None:
+            trend = _trend_status(c)
+        if not trend[0 if bullish else 1]:
+            continue
+        out[kind] = _hit(sub_close, c, v, p1, p2)
+    return out
@@ -84,13 +84,11 @@ async def test_stop_wave_scanner_cancels_task():
     key = mgr._wave_key(["TSLA"], "5m")
     task = mgr.monitors[key]["task"]
 
-    result = mgr.stop_wave_scanner(["TSLA"], interval="5m")
+    result = await mgr.stop_wave_scanner(["TSLA"], interval="5m")
 
     assert result["status"] == "stopped"
     assert key not in mgr.monitors
-    # Give the event loop one tick to process the cancellation request
-    await asyncio.sleep(0)
-    assert task.cancelled() or task.done()
+    assert task.cancelled()  # awaited, not just requested
 
 
 @pytest.mark.asyncio
@@ -152,12 +150,13 @@ def test_start_wave_scanner_invalid_interval():
     assert "interval" in result["message"].lower()
 
 
-def test_stop_wave_scanner_not_found():
+@pytest.mark.asyncio
+async def test_stop_wave_scanner_not_found():
     """stop_wave_scanner for non-existent key returns not_found."""
     mgr = MonitorManager()
     mgr.provider = _mock_provider()
 
-    result = mgr.stop_wave_scanner(["ZZZZ"], interval="5m")
+    result = await mgr.stop_wave_scanner(["ZZZZ"], interval="5m")
     assert result["status"] == "not_found"
 
 
@@ -0,0 +1,214 @@
+"""
+Unit tests for app/signals/divergence.py.
+
+The whole-history `scan_divergences` must produce exactly the events a
+bar-by-bar replay of the live detectors would — first hit per pivot
+pair, at the bar it first becomes detectable.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.indicators.rsi import RSI
+from app.signals import divergence as dv
+
+_DETECTORS = {
+    "hidden_bullish": dv.detect_hidden_bullish,
+    "hidden_bearish": dv.detect_hidden_bearish,
+    "regular_bullish": dv.detect_regular_bullish,
+    "regular_bearish": dv.detect_regular_bearish,
+}
+
+
+def _walk(n: int, seed: int) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2026-01-05 14:30", periods=n, freq="1min", tz="UTC")
+    return pd.Series(100.0 + np.cumsum(rng.normal(0, 0.4, n)), index=idx)
+
+
+def _replay(close: pd.Series, ind: pd.Series, kind: str, lookback: int, k: int) -> pd.DataFrame:
+    """Reference: the O(N * lookback) per-bar loop the scan replaces."""
+    detector = _DETECTORS[kind]
+    rows, seen = [], set()
+    for i in range(len(close)):
+        hit = detector(close.iloc[:i + 1], ind.iloc[:i + 1], lookback=lookback, k=k)
+        if hit and (hit["p1_ts"], hit["p2_ts"]) not in seen:
+            seen.add((hit["p1_ts"], hit["p2_ts"]))
+            rows.append((close.index[i], hit["p1_ts"], hit["p2_ts"],
+                         float(hit["price"]), float(hit["indicator_value"])))
+    return pd.DataFrame(rows, columns=dv.SCAN_COLUMNS)
+
+
+@pytest.mark.parametrize("kind", sorted(_DETECTORS))
+@pytest.mark.parametrize("trend_filter", [False, True])
+def test_scan_matches_per_bar_replay(kind, trend_filter, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "use_trend_filter", trend_filter)
+    monkeypatch.setattr(settings, "ema_period", 20)
+    close = _walk(400, seed=7)
+    ind = RSI(period=14).compute(close)
+
+    got = dv.scan_divergences(close, ind, kind, lookback=60, k=3)
+    want = _replay(close, ind, kind, lookback=60, k=3)
+    assert trend_filter or len(want) > 0
+    pd.testing.assert_frame_equal(got, want)
+
+
+def test_scan_shared_trend_cache(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "use_trend_filter", True)
+    monkeypatch.setattr(settings, "ema_period", 20)
+    close = _walk(400, seed=7)
+    ind = RSI(period=14).compute(close)
+    cache: dict = {}
+    for kind in sorted(_DETECTORS):
+        got = dv.scan_divergences(close, ind, kind, lookback=60, k=3, trend_cache=cache)
+        pd.testing.assert_frame_equal(got, dv.scan_divergences(close, ind, kind, lookback=60, k=3))
+    assert cache
+
+
+def _loop_pivots(close: pd.Series, k: int, low: bool, strict: bool) -> list:
+    """Reference: the original per-bar .iloc implementation."""
+    out = []
+    for i in range(k, len(close) - k):
+        c = close.iloc[i]
+        left, right = close.iloc[i - k:i], close.iloc[i + 1:i + k + 1]
+        win = close.iloc[i - k:i + k + 1]
+        if low and c == win.min() and (not strict or (c < left.min() and c < right.min())):
+            out.append(close.index[i])
+        if not low and c == win.max() and (not strict or (c > left.max() and c > right.max())):
+            out.append(close.index[i])
+    return out
+
+
+@pytest.mark.parametrize("holes", [True, False])
+@pytest.mark.parametrize("backend", ["numpy", "bottleneck"])
+@pytest.mark.parametrize("strict", [True, False])
+def test_pivot_finders_match_loop_reference(strict, backend, holes, monkeypatch) -> None:
+    if backend == "numpy":
+        monkeypatch.setattr(dv, "bn", None)
+    elif dv.bn is None:
+        pytest.skip("bottleneck not installed")
+    close = _walk(300, seed=3).round(1)  # rounding forces flat ties
+    if holes:
+        close.iloc[[40, 41, 42, 150]] = np.nan
+    for k in (1, 3, 5):
+        assert dv.find_pivot_lows(close, k, strict) == _loop_pivots(close, k, True, strict)
+        assert dv.find_pivot_highs(close, k, strict) == _loop_pivots(close, k, False, strict)
+        assert dv.find_pivot_lows(close, k, strict, max_pivots=2) == _loop_pivots(close, k, True, strict)[-2:]
+    assert dv.find_pivot_lows(close.head(6), 3, strict) == []
+
+
+def test_scan_empty_and_unknown_kind() -> None:
+    close = _walk(5, seed=1)
+    out = dv.scan_divergences(close, close, "regular_bullish", lookback=60, k=3)
+    assert out.empty and list(out.columns) == dv.SCAN_COLUMNS
+    with pytest.raises(ValueError):
+        dv.scan_divergences(close, close, "sideways", lookback=60, k=3)
+
+
+def test_ema_last_matches_pandas_ewm() -> None:
+    close = _walk(120, seed=5)
+    for period in (5, 20, 50):
+        want = dv._ema(close, period).iloc[-1]
+        assert dv._ema_last(close.to_numpy(), period) == pytest.approx(want, rel=1e-12)
+
+
+@pytest.mark.parametrize("trend_filter", [False, True])
+def test_detect_divergences_matches_individual_detectors(trend_filter, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "use_trend_filter", trend_filter)
+    monkeypatch.setattr(settings, "ema_period", 20)
+    close = _walk(400, seed=7)
+    ind = RSI(period=14).compute(close)
+    fired = set()
+    for i in range(60, len(close)):
+        c, v = close.iloc[:i + 1], ind.iloc[:i + 1]
+        got = dv.detect_divergences(c, v, lookback=60, k=3)
+        for kind, detector in _DETECTORS.items():
+            assert got[kind] == detector(c, v, lookback=60, k=3)
+            if got[kind]:
+                fired.add(kind)
+    assert trend_filter or fired == set(_DETECTORS)
+
+
+def test_detectors_align_misordered_indicator() -> None:
+    close = _walk(200, seed=7)
+    ind = RSI(period=14).compute(close)
+    shuffled = ind.sample(frac=1.0, random_state=0)  # same labels, different order
+    for kind, detector in _DETECTORS.items():
+        assert detector(close, shuffled, lookback=60, k=3) == detector(close, ind, lookback=60, k=3)
+    assert dv.detect_divergences(close, shuffled, 60, 3) == dv.detect_divergences(close, ind, 60, 3)
+
+
+def test_trend_status_skips_nans(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "use_trend_filter", True)
+    monkeypatch.setattr(settings, "ema_period", 20)
+    vals = _walk(60, seed=9).to_numpy()
+    holey = np.insert(vals, [5, 30], np.nan)
+    assert dv._trend_status(holey) == dv._trend_status(vals)
+    assert dv._trend_status(vals[:24]) == (False, False)  # < EMA_PERIOD + 5 bars
+
+
+def test_pivot_positions_round_trip() -> None:
+    close = _walk(300, seed=3).round(1)
+    pos = dv.pivot_positions(close.to_numpy(), 3, low=True)
+    assert pos.dtype == np.int64 and (np.diff(pos) > 0).all()
+    assert dv.to_timestamps(pos, close.index) == dv.find_pivot_lows(close, 3)
+    assert list(dv.pivot_positions(close.to_numpy(), 3, low=False, max_pivots=2)) == list(
+        dv.pivot_positions(close.to_numpy(), 3, low=False)[-2:]
+    )
+
+
+def test_scan_by_symbol_matches_per_symbol_scan() -> None:
+    import polars as pl
+
+    frames, want = [], {}
+    for sym, seed in (("AAPL", 7), ("MSFT", 8)):
+        close = _walk(400, seed=seed)
+        ind = RSI(period=14).compute(close)
+        want[sym] = dv.scan_divergences(close, ind, "regular_bullish", lookback=60, k=3)
+        frames.append(pl.DataFrame({"symbol": sym, "timestamp": close.index,
+                                    "close": close.to_numpy(), "indicator": ind.to_numpy()}))
+    shuffled = pl.concat(frames).sample(fraction=1.0, shuffle=True, seed=0)
+
+    got = dv.scan_divergences_by_symbol(shuffled, "regular_bullish", lookback=60, k=3)
+    assert got.columns == ["symbol", *dv.SCAN_COLUMNS]
+    for sym, expected in want.items():
+        mine = got.filter(pl.col("symbol") == sym).drop("symbol").to_pandas()
+        assert len(mine) == len(expected) > 0
+        assert list(mine["p2_ts"]) == list(expected["p2_ts"])
+        np.testing.assert_array_equal(mine["price"], expected["price"])
+    empty = dv.scan_divergences_by_symbol(shuffled.head(0), "regular_bullish", lookback=60, k=3)
+    assert empty.is_empty() and empty.columns == got.columns
+
+
+@pytest.mark.parametrize("strict", [True, False])
+def test_pivot_stream_matches_batch(strict) -> None:
+    vals = _walk(500, seed=4).round(1).to_numpy(copy=True)  # rounding forces ties
+    vals[[40, 41, 42, 150, 300]] = np.nan
+    for k in (1, 3, 5):
+        stream = dv.PivotStream(k, strict=strict)
+        lows, highs = [], []
+        for v in vals:
+            lo, hi = stream.push(v)
+            if lo is not None:
+                lows.append(lo)
+            if hi is not None:
+                highs.append(hi)
+        assert lows == list(dv.pivot_positions(vals, k, low=True, strict=strict))
+        assert highs == list(dv.pivot_positions(vals, k, low=False, strict=strict))
+
+
+@pytest.mark.parametrize("strict", [True, False])
+@pytest.mark.parametrize("holes", [True, False])
+def test_pivot_positions_batch_matches_rows(strict, holes) -> None:
+    rows = np.stack([_walk(200, seed=s).round(1).to_numpy() for s in range(4)])
+    rows[2, :30] = np.nan  # a shorter history, left-padded
+    if holes:
+        rows[1, 50] = np.nan
+    for k in (1, 3):
+        for low in (True, False):
+            got = dv.pivot_positions_batch(rows, k, low=low, strict=strict)
+            want = [dv.pivot_positions(r, k, low=low, strict=strict) for r in rows]
+            assert all(np.array_equal(g, w) for g, w in zip(got, want))
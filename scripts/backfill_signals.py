@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Backfill divergence signals over history into the ClickHouse `signals` table.
+
+Replays what the live monitor (`app/services/live/monitor_service.py`)
+would have fired had it been running: same indicators, same detector
+settings (`LOOKBACK_BARS`, `PIVOT_K`, trend filter / quality thresholds),
+same row shape. Bars come through `HistoricalDataLoader` (CH first,
+then the parquet cache when `USE_PARQUET_CACHE=true`, provider REST
+last), so a re-run after adding symbols only fetches the new ones.
+
+Detection uses `scan_divergences` — one pass over the whole history per
+(symbol, signal type) instead of calling the detector once per bar on a
+growing slice, which is quadratic in history length. With `--workers N`
+the per-symbol scans run in a process pool so a large watchlist uses
+more than one core.
+
+Run:
+    poetry run python scripts/backfill_signals.py --symbols AAPL,MSFT --days 30
+    poetry run python scripts/backfill_signals.py --symbols SPY --indicator macd \\
+        --signal-types regular_bullish_divergence --dry-run
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+_HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(_HERE.parent))
+
+from app.config import get_history_provider, settings  # noqa: E402
+from app.db import queries  # noqa: E402
+from app.services.ingest.historical_loader import HistoricalDataLoader  # noqa: E402
+from app.services.live.monitor_service import DETECTOR_MAP, INDICATOR_MAP  # noqa: E402
+from app.signals.divergence import scan_divergences  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s",
+                    datefmt="%H:%M:%S")
+logger = logging.getLogger("backfill-signals")
+
+
+def scan_symbol(df, symbol: str, indicator_name: str, signal_types: list[str]) -> list[dict]:
+    """CPU side: indicator + one whole-history scan per signal type -> signal rows."""
+    indicator = INDICATOR_MAP[indicator_name]()
+    if indicator.uses_high_low:
+        ind_values = indicator.compute(df["close"], df["high"], df["low"])
+    else:
+        ind_values = indicator.compute(df["close"])
+
+    pending: list[dict] = []
+    trend_cache: dict = {}  # per-bar trend EMA, shared by the bull and bear kinds
+    for signal_type in signal_types:
+        events = scan_divergences(
+            df["close"],
+            ind_values,
+            signal_type.removesuffix("_divergence"),
+            lookback=settings.lookback_bars,
+            k=settings.pivot_k,
+            trend_cache=trend_cache,
+        )
+        logger.info("%s %s/%s: %d signals over %d bars",
+                    symbol, indicator_name, signal_type, len(events), len(df))
+        pending.extend(
+            {
+                "symbol": symbol,
+                "signal_type": signal_type,
+                "indicator": indicator_name,
+                "ts_signal": ev.p2_ts,  # same as the live monitor's rows
+                "price_at_signal": float(ev.price),
+                "indicator_value": float(ev.indicator_value),
+                "p1_ts": ev.p1_ts,
+                "p2_ts": ev.p2_ts,
+            }
+            for ev in events.itertuples(index=False)
+        )
+    return pending
+
+
+async def backfill_symbol(
+    loader: HistoricalDataLoader,
+    symbol: str,
+    indicator_name: str,
+    signal_types: list[str],
+    days: int,
+    *,
+    dry_run: bool = False,
+    executor: Optional[Executor] = None,
+) -> int:
+    """
+    Scan one symbol's history for every requested signal type. Returns
+    rows found. The scan runs on `executor` (default: the loop's thread
+    pool).
+    """
+    df = await loader.load_bars(symbol, days_lookback=days, purpose="backfill")
+    if df.empty:
+        logger.warning("%s: no bars, skipped", symbol)
+        return 0
+
+    # Off the event loop so other symbols' fetches/inserts keep moving.
+    pending = await asyncio.get_running_loop().run_in_executor(
+        executor, scan_symbol, df, symbol, indicator_name, signal_types
+    )
+    if dry_run or not pending:
+        return len(pending)
+
+    # One round-trip per symbol; drop divergences a previous run already
+    # stored (`signals` has no unique key to do this on insert).
+    existing = await queries.signal_keys_async(symbol, df.index[0], df.index[-1])
+    rows = [r for r in pending if queries.signal_key(r) not in existing]
+    await queries.insert_signals_batch_async(rows)
+    logger.info("%s: inserted %d (%d already stored)", symbol, len(rows), len(pending) - len(rows))
+    return len(pending)
+
+
+async def backfill(symbols: list[str], indicator_name: str, signal_types: list[str],
+                   days: int, *, concurrency: int = 4, workers: int = 0,
+                   dry_run: bool = False) -> int:
+    """
+    Backfill `symbols` with at most `concurrency` in flight. Provider
+    fetches dominate wall time and overlap freely; the bound keeps the
+    provider rate limit and ClickHouse insert fan-out in check. A failed
+    symbol is logged and skipped rather than aborting the batch.
+
+    `workers > 1` moves the CPU-bound scans into a process pool of that
+    size; otherwise they share the GIL on the default thread pool.
+    """
+    loader = HistoricalDataLoader(get_history_provider())
+    sem = asyncio.Semaphore(max(1, concurrency))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    async def _bounded(symbol: str) -> int:
+        async with sem:
+            try:
+                return await backfill_symbol(loader, symbol, indicator_name, signal_types,
+                                             days, dry_run=dry_run, executor=pool)
+            except Exception as e:
+                logger.error("%s: backfill failed: %s", symbol, e)
+                return 0
+
+    try:
+        total = sum(await asyncio.gather(*(_bounded(s) for s in symbols)))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    logger.info("done: %d signals across %d symbols%s",
+                total, len(symbols), " (dry run, nothing written)" if dry_run else "")
+    return total
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--symbols", required=True, help="comma-separated tickers")
+    ap.add_argument("--indicator", default="rsi", choices=sorted(INDICATOR_MAP))
+    ap.add_argument("--signal-types", default="all",
+                    help=f"comma-separated, or 'all' ({', '.join(sorted(DETECTOR_MAP))})")
+    ap.add_argument("--days", type=int, default=30, help="history window in days")
+    ap.add_argument("--concurrency", type=int, default=4,
+                    help="symbols processed in parallel (provider fetch + insert)")
+    ap.add_argument("--workers", type=int, default=0,
+                    help="processes for the divergence scans (0/1 = in-process threads)")
+    ap.add_argument("--dry-run", action="store_true", help="scan and report, write nothing")
+    a = ap.parse_args(argv)
+
+    symbols = [s.strip().upper() for s in a.symbols.split(",") if s.strip()]
+    if a.signal_types == "all":
+        signal_types = sorted(DETECTOR_MAP)
+    else:
+        signal_types = [s.strip() for s in a.signal_types.split(",") if s.strip()]
+        unknown = sorted(set(signal_types) - set(DETECTOR_MAP))
+        if unknown:
+            ap.error(f"unknown signal types: {unknown}")
+
+    asyncio.run(backfill(symbols, a.indicator, signal_types, a.days,
+                         concurrency=a.concurrency, workers=a.workers,
+                         dry_run=a.dry_run))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Unit tests for `scripts/backfill_signals.py` re-run dedup.
+
+ClickHouse is replaced by an in-memory fake that reads DateTime64 back
+naive (clickhouse-connect's default `naive_utc`), like the real client.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+import backfill_signals as cli  # noqa: E402
+
+
+class _FakeClient:
+    def __init__(self) -> None:
+        self.rows: list[dict] = []
+
+    def insert(self, table, data, column_names, **kwargs) -> None:
+        self.rows.extend(dict(zip(column_names, r)) for r in data)
+
+    def query(self, sql, parameters):
+        class _Result:
+            result_rows = [
+                (r["signal_type"], r["indicator"],
+                 pd.Timestamp(r["p1_ts"]).tz_convert(None).to_pydatetime(),
+                 pd.Timestamp(r["p2_ts"]).tz_convert(None).to_pydatetime())
+                for r in self.rows if r["symbol"] == parameters["sym"]
+            ]
+        return _Result()
+
+
+class _Loader:
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.df = df
+
+    async def load_bars(self, symbol, **kw):
+        return self.df
+
+
+def _bars(n: int = 3000) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    close = 100.0 + np.cumsum(rng.normal(0, 0.4, n))
+    idx = pd.date_range("2026-03-02 14:30", periods=n, freq="1min", tz="UTC")
+    return pd.DataFrame({"open": close, "high": close + 0.1, "low": close - 0.1,
+                         "close": close, "volume": 10.0}, index=idx)
+
+
+def test_rerun_does_not_duplicate_stored_signals() -> None:
+    client = _FakeClient()
+    loader = _Loader(_bars())
+    types = sorted(cli.DETECTOR_MAP)
+
+    async def _run():
+        return await cli.backfill_symbol(loader, "AAPL", "rsi", types, days=30)
+
+    with patch("app.db.queries.get_client", return_value=client):
+        found = asyncio.run(_run())
+        stored = len(client.rows)
+        assert found == stored > 0
+        assert asyncio.run(_run()) == found  # same history scanned again
+
+    assert len(client.rows) == stored
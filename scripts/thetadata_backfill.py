@@ -115,6 +115,17 @@ def _pick(df: pd.DataFrame, key: str, required: bool = True) -> str | None:
     return None
 
 
+_tls = threading.local()
+
+
+def _session() -> requests.Session:
+    """The calling thread's keep-alive session (fetches run on a thread pool)."""
+    session = getattr(_tls, "session", None)
+    if session is None:
+        session = _tls.session = requests.Session()
+    return session
+
+
 def _fetch_csv(path: str, params: dict) -> pd.DataFrame:
     """GET with Next-Page pagination; empty frame on the no-data status."""
     frames: list[pd.DataFrame] = []
@@ -122,7 +133,7 @@ def _fetch_csv(path: str, params: dict) -> pd.DataFrame:
     for attempt in range(4):
         try:
             while True:
-                resp = requests.get(url, params=page_params, timeout=300)
+                resp = _session().get(url, params=page_params, timeout=300)
                 if resp.status_code == 472:  # theta: no data for the request
                     return pd.DataFrame()
                 resp.raise_for_status()
@@ -55,6 +55,7 @@ T2_DEFAULT_COLD_SYMBOL = "ARM"      # IPO'd Sep 2023, NOT in our seed universe
 T3_DEFAULT_OLD_SYMBOL = "MSFT"     # listed 1986, has full Schwab daily history
 
 API_BASE = "http://localhost:8000"
+_SESSION = requests.Session()  # one keep-alive connection across the tier checks
 T1_LATENCY_TARGET_MS = 500   # chart read must feel instant
 T2_WARMUP_TIMEOUT_S = 600    # 10 min for cold-add full chain
 T3_DAILY_TIMEOUT_S = 120     # 2 min for Schwab 10y daily fetch
@@ -130,7 +131,7 @@ def test_t1_hot_cache(symbol: str) -> TestResult:
 
     api_started = time.time()
     try:
-        r = requests.get(
+        r = _SESSION.get(
             f"{API_BASE}/api/v1/bars",
             params={"symbol": symbol, "interval": "1m", "lookback_days": 30},
             timeout=10,
@@ -198,7 +199,7 @@ def test_t2_cold_add(symbol: str) -> TestResult:
     # Fire the add
     add_started = time.time()
     try:
-        r = requests.post(
+        r = _SESSION.post(
             f"{API_BASE}/api/v1/stream",
             json={"symbol": symbol},
             timeout=10,
@@ -285,7 +286,7 @@ def test_t3_schwab_10y_daily(symbol: str) -> TestResult:
 
     # Force=true bypasses the coverage short-circuit so this is a real test
     try:
-        r = requests.post(
+        r = _SESSION.post(
             f"{API_BASE}/api/v1/backfill/daily",
             json={"symbols": [symbol], "days": 365 * 10, "force": True},
             timeout=10,
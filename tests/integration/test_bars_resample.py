@@ -109,7 +109,7 @@ def _seed_minute_bars(
 # ---------- Tests ----------
 
 
-def test_1m_passthrough_matches_list_bars_desc(fresh_db) -> None:
+def test_1m_passthrough_matches_list_bars_latest(fresh_db) -> None:
     start = datetime(2026, 1, 5, 14, 30, tzinfo=timezone.utc)  # Monday 9:30 ET
     _seed_minute_bars(TEST_SYMBOL, start, minutes=10)
 
@@ -50,4 +50,9 @@ async def test_historical(feed: DataFeed = DataFeed.SIP):
         traceback.print_exc()
 
 if __name__ == "__main__":
-    asyncio.run(test_historical())
+    # Same loop as the API (uvicorn --loop uvloop); uvloop is POSIX-only.
+    try:
+        from uvloop import new_event_loop
+    except ImportError:
+        new_event_loop = None
+    asyncio.run(test_historical(), loop_factory=new_event_loop)
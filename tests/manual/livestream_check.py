@@ -25,24 +25,29 @@ async def test_stream(feed: DataFeed = DataFeed.IEX):
     # Counter for received bars
     bar_count = 0
     max_bars = 5  # Stop after receiving 5 bars
+    done = asyncio.Event()
     
     async def on_bar(bar):
         """Callback for each bar received"""
         nonlocal bar_count
         bar_count += 1
         
-        print(f"\n📊 Bar #{bar_count} received:")
-        print(f"   Symbol: {bar.symbol}")
-        print(f"   Timestamp: {bar.timestamp}")
-        print(f"   Open: ${bar.open:.2f}")
-        print(f"   High: ${bar.high:.2f}")
-        print(f"   Low: ${bar.low:.2f}")
-        print(f"   Close: ${bar.close:.2f}")
-        print(f"   Volume: {bar.volume:,.0f}")
+        # One write per bar (not eight) while on the event loop
+        print(
+            f"\n📊 Bar #{bar_count} received:\n"
+            f"   Symbol: {bar.symbol}\n"
+            f"   Timestamp: {bar.timestamp}\n"
+            f"   Open: ${bar.open:.2f}\n"
+            f"   High: ${bar.high:.2f}\n"
+            f"   Low: ${bar.low:.2f}\n"
+            f"   Close: ${bar.close:.2f}\n"
+            f"   Volume: {bar.volume:,.0f}"
+        )
         
         if bar_count >= max_bars:
             print(f"\n✅ Successfully received {max_bars} bars, stopping stream...")
             provider.stop_stream()
+            done.set()
     
     # Test parameters
     symbols = ["SPY", "QQQ"]
@@ -56,20 +61,16 @@ async def test_stream(feed: DataFeed = DataFeed.IEX):
         # Subscribe to bars
         provider.subscribe_bars(on_bar, symbols)
         
-        # Wait for bars or timeout after 60 seconds
+        # Wait for bars or timeout after 60 seconds (returns as soon as
+        # on_bar sees the last one, no polling)
         timeout = 60
-        start_time = asyncio.get_event_loop().time()
-        
-        while bar_count < max_bars:
-            await asyncio.sleep(1)
-            
-            # Check for timeout
-            if asyncio.get_event_loop().time() - start_time > timeout:
-                print(f"\n⏱️ Timeout after {timeout} seconds")
-                if bar_count == 0:
-                    print("⚠️  No bars received - market may be closed")
-                    print("   Market hours: 9:30 AM - 4:00 PM ET, Mon-Fri")
-                break
+        try:
+            await asyncio.wait_for(done.wait(), timeout)
+        except TimeoutError:
+            print(f"\n⏱️ Timeout after {timeout} seconds")
+            if bar_count == 0:
+                print("⚠️  No bars received - market may be closed")
+                print("   Market hours: 9:30 AM - 4:00 PM ET, Mon-Fri")
         
         if bar_count > 0:
             print(f"\n✅ Test complete! Received {bar_count} bars")
@@ -88,4 +89,9 @@ async def test_stream(feed: DataFeed = DataFeed.IEX):
         print("Done!")
 
 if __name__ == "__main__":
-    asyncio.run(test_stream())
\ No newline at end of file
+    # Same loop as the API (uvicorn --loop uvloop); uvloop is POSIX-only.
+    try:
+        from uvloop import new_event_loop
+    except ImportError:
+        new_event_loop = None
+    asyncio.run(test_stream(), loop_factory=new_event_loop)
\ No newline at end of file